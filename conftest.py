@@ -93,3 +93,38 @@ def group_instance(post, get, get_all, api_client):
         group_instance.permissions.add(permission['id'])
 
     return group_instance
+
+
+@pytest.fixture
+def superuser_client(api_client):
+    """
+    USER_TOKEN expires, so tests that only care about the behaviour of a
+    view (not about permissions) authenticate a baker made superuser.
+    """
+    from model_bakery import baker
+    from core.models import User
+
+    user = baker.make(User, is_superuser=True, is_staff=True)
+    api_client.force_authenticate(user=user)
+    return api_client
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """ Cached data must not leak between tests, the database doesn't """
+    from django.core.cache import cache
+
+    cache.clear()
+
+
+@pytest.fixture
+def shared_cache(settings, tmp_path):
+    """
+    A cache the workers share, a file based one so another instance on
+    the same directory acts as another worker. Returns the directory.
+    """
+    settings.CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': str(tmp_path / 'cache'),
+    }}
+    return tmp_path / 'cache'
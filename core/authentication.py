@@ -0,0 +1,49 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+
+from .cache import cache_is_shared
+from .permissions import permissions_version
+
+# User fields copied into the access token, see add_authorization_claims
+USER_CLAIMS = ['email', 'is_active', 'is_staff', 'is_superuser']
+
+
+def add_authorization_claims(token, user):
+    """ The user fields the permission checks read and the permissions version they were read at """
+    for claim in USER_CLAIMS:
+        token[claim] = getattr(user, claim)
+    token['perms_version'] = permissions_version(user.pk)
+    return token
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that builds the user from the token claims instead
+    of loading the row, only the claimed fields are set and any other
+    field is loaded on first access. When the user or their permissions
+    changed after the token was issued [perms_version differs] or the
+    token has no claims, the user is read from the DB as usual. So is it
+    with a per-process cache, a change made through another worker
+    doesn't bump the versions this one compares against.
+    """
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        stamp = validated_token.get('perms_version')
+        if (not cache_is_shared() or user_id is None or stamp is None
+                or stamp != permissions_version(user_id)):
+            return super().get_user(validated_token)
+
+        if not validated_token['is_active']:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+
+        id_field = self.user_model._meta.get_field(api_settings.USER_ID_FIELD)
+        claims = {id_field.attname: id_field.to_python(user_id),
+                  **{claim: validated_token[claim] for claim in USER_CLAIMS}}
+        # from_db wants the values in the order of the model fields,
+        # the fields left out are deferred
+        field_names = [field.attname for field in self.user_model._meta.concrete_fields
+                       if field.attname in claims]
+        return self.user_model.from_db(
+            'default', field_names, [claims[name] for name in field_names])
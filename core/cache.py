@@ -0,0 +1,60 @@
+import time
+from functools import partial
+
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+# Backends whose entries live in the process, every worker has its own
+PER_PROCESS_BACKENDS = (LocMemCache, DummyCache)
+
+
+def _version_key(namespace):
+    return f'version:{namespace}'
+
+
+def _initial_version():
+    """
+    A lost version [evicted, cache restarted] restarts from the clock,
+    so it's bigger than any version handed out before and stale entries
+    are never matched again.
+    """
+    return time.time_ns() // 1000
+
+
+def cache_is_shared():
+    """
+    False when each worker has its own copy of the cache, a version
+    bumped by one worker isn't seen by the others then.
+    """
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], PER_PROCESS_BACKENDS)
+
+
+def get_version(namespace):
+    """ Current version of 'namespace', put it in the cache keys of data depending on it """
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_version(namespace):
+    """ Invalidate every cache entry keyed with the current version of 'namespace' """
+    key = _version_key(namespace)
+    try:
+        return cache.incr(key)
+    except ValueError:  # No version yet
+        cache.add(key, _initial_version(), timeout=None)
+        return cache.get(key)
+
+
+def bump_version_on_commit(namespace, using=DEFAULT_DB_ALIAS):
+    """
+    bump_version once the transaction commits, right away outside of one.
+    Bumped before the COMMIT, a request reading in between would cache
+    the old rows under the new version and they'd never be invalidated.
+    """
+    transaction.on_commit(partial(bump_version, namespace), using=using)
@@ -0,0 +1,40 @@
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from .cache import get_version
+
+
+class VersionedCacheMixin:
+    """
+    Cache the data of the list and retrieve responses under the current
+    version of 'cache_namespace', bump it [core/cache.py] from the
+    post_save/post_delete of the models the responses read and they're
+    served from the cache until the data actually changes.
+
+    The key is the full path so filters and pages are cached apart.
+    Authentication and permissions still run on every request, only the
+    queries and the serialization are skipped.
+    """
+    cache_namespace = None
+    # Keys of old versions are never read again, they just expire
+    cache_timeout = 60 * 60 * 24
+
+    def cached_response(self, request, get_response):
+        key = (f'response:{self.cache_namespace}:{get_version(self.cache_namespace)}'
+               f':{request.get_full_path()}')
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = get_response()
+        if response.status_code == 200:
+            cache.set(key, response.data, self.cache_timeout)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, lambda: super(VersionedCacheMixin, self).list(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            request, lambda: super(VersionedCacheMixin, self).retrieve(request, *args, **kwargs))
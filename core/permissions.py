@@ -1,6 +1,84 @@
+from django.core.cache import cache
 from rest_framework import permissions
 
-class ReadModelPermission(permissions.DjangoModelPermissions):
+from .cache import bump_version_on_commit, cache_is_shared, get_version
+
+# Bumped when a group's permissions change, that's every member at once
+PERMISSIONS_CACHE_NAMESPACE = 'permissions'
+PERMISSIONS_CACHE_TIMEOUT = 60 * 60
+# The PermissionViewSet responses, bumped when a Permission is saved/deleted
+PERMISSION_CATALOG_CACHE_NAMESPACE = 'permission-catalog'
+
+
+def user_permissions_namespace(user_id):
+    """ Bumped when the user's groups or own permissions change """
+    return f'permissions:user:{user_id}'
+
+
+def invalidate_permissions(user_ids=None):
+    """
+    The cached permissions of 'user_ids', of every user when None. Once
+    the transaction commits, a request reading the old rows before that
+    would cache them under the new version.
+    """
+    if user_ids is None:
+        bump_version_on_commit(PERMISSIONS_CACHE_NAMESPACE)
+        return
+    for user_id in user_ids:
+        bump_version_on_commit(user_permissions_namespace(user_id))
+
+
+def permissions_version(user_id):
+    """ Changes whenever the permissions or the user row of 'user_id' may have """
+    return (f'{get_version(PERMISSIONS_CACHE_NAMESPACE)}'
+            f'.{get_version(user_permissions_namespace(user_id))}')
+
+
+def get_cached_permissions(user):
+    """
+    user.get_all_permissions() [the user and group permissions, two
+    queries] shared by the workers through the cache until invalidated.
+    With a per-process cache [LocMemCache] a revoke would only reach the
+    worker that handled it, so they're read every time instead.
+    """
+    if not cache_is_shared():
+        return user.get_all_permissions()
+    key = f'permissions:{user.pk}:{permissions_version(user.pk)}'
+    perms = cache.get(key)
+    if perms is None:
+        perms = user.get_all_permissions()
+        cache.set(key, perms, PERMISSIONS_CACHE_TIMEOUT)
+    return perms
+
+
+class CachedModelPermissions(permissions.DjangoModelPermissions):
+    """
+    DjangoModelPermissions checking the required permissions against
+    get_cached_permissions instead of user.has_perms. is_active and
+    is_superuser are read from the request user, they're never cached.
+    """
+
+    def has_permission(self, request, view):
+        user = request.user
+        if not user or (not user.is_authenticated and self.authenticated_users_only):
+            return False
+
+        # Workaround to ensure DjangoModelPermissions are not applied
+        # to the root view when using DefaultRouter.
+        if getattr(view, '_ignore_model_permissions', False):
+            return True
+
+        queryset = self._queryset(view)
+        perms = self.get_required_permissions(request.method, queryset.model)
+
+        if not user.is_active:
+            return False
+        if user.is_superuser:
+            return True
+        return set(perms) <= get_cached_permissions(user)
+
+
+class ReadModelPermission(CachedModelPermissions):
     def __init__(self) -> None:
         self.perms_map = {
         'OPTIONS': [],
@@ -8,7 +86,7 @@ class ReadModelPermission(permissions.DjangoModelPermissions):
         'GET': ['%(app_label)s.view_%(model_name)s']
     }
 
-class CreateModelPermission(permissions.DjangoModelPermissions):
+class CreateModelPermission(CachedModelPermissions):
     def __init__(self) -> None:
         self.perms_map = {
         'OPTIONS': [],
@@ -17,7 +95,7 @@ class CreateModelPermission(permissions.DjangoModelPermissions):
         'POST': ['%(app_label)s.add_%(model_name)s']
     }
 
-class UpdateModelPermission(permissions.DjangoModelPermissions):
+class UpdateModelPermission(CachedModelPermissions):
     def __init__(self) -> None:
         self.perms_map = {
         'OPTIONS': [],
@@ -27,7 +105,7 @@ class UpdateModelPermission(permissions.DjangoModelPermissions):
         'PATCH': ['%(app_label)s.change_%(model_name)s'],
     }
 
-class DeleteModelPermission(permissions.DjangoModelPermissions):
+class DeleteModelPermission(CachedModelPermissions):
     def __init__(self) -> None:
         self.perms_map = {
             'OPTIONS': [],
@@ -35,4 +113,3 @@ class DeleteModelPermission(permissions.DjangoModelPermissions):
             'GET': ['%(app_label)s.view_%(model_name)s'],
             'DELETE': ['%(app_label)s.delete_%(model_name)s']
         }
-       
\ No newline at end of file
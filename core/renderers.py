@@ -0,0 +1,32 @@
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# The types orjson doesn't serialize [lazy strings, timedelta, Decimals not
+# coming from a FloatDecimalField...] are converted the same way as with the
+# default JSONRenderer
+_default = JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer on orjson, the encoder is written in Rust and serializes
+    dicts, lists, strings, datetimes and UUIDs without calling back into
+    Python. The output matches JSONRenderer: compact, UTF-8, datetimes in
+    UTC end with 'Z' and Decimals [salary, cgpa] are numbers since
+    COERCE_DECIMAL_TO_STRING is off. The serializers hand those over as
+    floats already [core.serializers.FloatDecimalField], a Decimal goes
+    through the slow 'default' callback. Only 'indent' 2 is supported, the
+    browsable API asks for it.
+    """
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = self.options
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_default, option=options)
@@ -1,11 +1,37 @@
 import re
 from django.contrib.auth.models import Group, Permission
+from django.db import models
 from djoser.serializers import UserCreateSerializer as BaseUserCreateSerializer
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
 
+from . authentication import add_authorization_claims
 from . models import User
 
 
+class FloatDecimalField(serializers.DecimalField):
+    """
+    With COERCE_DECIMAL_TO_STRING off the JSONEncoder turns a Decimal into
+    a float anyway, doing it here lets orjson write it without calling
+    back into Python [see core/renderers.py]. Same output.
+    """
+
+    def to_representation(self, value):
+        value = super().to_representation(value)
+        return value if isinstance(value, str) else float(value)
+
+
+class FloatDecimalMixin:
+    """ ModelSerializer mixin, the model DecimalFields [salary, cgpa] become FloatDecimalFields """
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.DecimalField: FloatDecimalField,
+    }
+
+
 class UserCreateSerializer(BaseUserCreateSerializer):
     confirm_password = serializers.CharField(
         write_only=True, required=True, style={'input_type': 'password'})
@@ -93,4 +119,34 @@ class ReadUserSerializer(serializers.ModelSerializer):
         fields = ['id', 'first_name', 'last_name', 'full_name', 'email']
 
     def get_full_name(self, user):
-        return f'{user.first_name} {user.last_name}'
\ No newline at end of file
+        return f'{user.first_name} {user.last_name}'
+
+class AuthorizationTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """ The refresh token claims are copied to its access tokens """
+    @classmethod
+    def get_token(cls, user):
+        return add_authorization_claims(super().get_token(user), user)
+
+
+class AuthorizationTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    The claims copied from the refresh token can be old, they're read
+    again. A user deleted or deactivated since it was issued gets a 401.
+    """
+
+    def validate(self, attrs):
+        # Before super(), some simplejwt versions get() the user there
+        try:
+            refresh = self.token_class(attrs['refresh'])
+        except TokenError as error:
+            raise InvalidToken(error.args[0])
+        user = User.objects.filter(pk=refresh.get(api_settings.USER_ID_CLAIM)).first()
+        if user is None:
+            raise AuthenticationFailed('User not found', code='user_not_found')
+        if not user.is_active:
+            raise AuthenticationFailed('User is inactive', code='user_inactive')
+
+        data = super().validate(attrs)
+        access = AccessToken(data['access'], verify=False)
+        data['access'] = str(add_authorization_claims(access, user))
+        return data
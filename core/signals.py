@@ -0,0 +1,49 @@
+from django.contrib.auth.models import Group, Permission
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_version_on_commit
+from .models import User
+from .permissions import PERMISSION_CATALOG_CACHE_NAMESPACE, invalidate_permissions
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_user_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    user.groups.add(...) [reverse=False] changes one user.
+    group.user_set.add(...) [reverse=True] changes the users in pk_set,
+    on clear pk_set is None and every user is invalidated.
+    """
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate_permissions([instance.pk])
+    elif pk_set is not None:
+        invalidate_permissions(pk_set)
+    else:
+        invalidate_permissions()
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def invalidate_group_permissions(sender, action, **kwargs):
+    if action.startswith('post_'):
+        invalidate_permissions()
+
+
+@receiver(post_delete, sender=Group)
+@receiver(post_delete, sender=Permission)
+def invalidate_deleted_permissions(sender, **kwargs):
+    invalidate_permissions()
+
+
+@receiver(post_save, sender=User)
+def invalidate_saved_user(sender, instance, created, **kwargs):
+    """ The access token claims [core/authentication.py] hold is_active etc. """
+    if not created:
+        invalidate_permissions([instance.pk])
+
+
+@receiver([post_save, post_delete], sender=Permission)
+def invalidate_permission_catalog(sender, **kwargs):
+    bump_version_on_commit(PERMISSION_CATALOG_CACHE_NAMESPACE)
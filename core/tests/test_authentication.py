@@ -0,0 +1,132 @@
+import pytest
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.authentication import StatelessJWTAuthentication
+from core.models import User
+from conftest import JWT
+
+TOKEN_ENDPOINT = '/auth/jwt/create/'
+REFRESH_ENDPOINT = '/auth/jwt/refresh/'
+APPLICATION_DATES_ENDPOINT = '/recruitment/application-dates/'
+
+
+def user_queries(context):
+    return [query for query in context.captured_queries
+            if 'FROM "core_user"' in query['sql']]
+
+
+@pytest.fixture
+def user():
+    user = User.objects.create_user(
+        email='d@gmail.com', password='Django@123', first_name='a', last_name='b')
+    group = baker.make(Group)
+    group.permissions.add(Permission.objects.get(codename='view_applicationdate'))
+    user.groups.add(group)
+    return user
+
+
+@pytest.fixture
+def tokens(user):
+    return APIClient().post(TOKEN_ENDPOINT, {'email': 'd@gmail.com',
+                                             'password': 'Django@123'}).data
+
+
+def client_with(access):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=JWT + access)
+    return client
+
+
+@pytest.mark.django_db
+class TestStatelessJWTAuthentication:
+    """
+    If you don't want field validation use Model Baker else add the fields manually.
+    baker.make(User, email='mecom'), Baker considers the email as valid.
+    """
+
+    def test_if_user_is_not_read_from_db_return_200(self, shared_cache, tokens):
+        client = client_with(tokens['access'])
+        client.get(APPLICATION_DATES_ENDPOINT)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(APPLICATION_DATES_ENDPOINT)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert user_queries(context) == []
+
+    def test_if_per_process_cache_reads_user_from_db_return_200(self, tokens):
+        client = client_with(tokens['access'])
+        client.get(APPLICATION_DATES_ENDPOINT)
+
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(APPLICATION_DATES_ENDPOINT)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert user_queries(context) != []
+
+    def test_if_token_has_authorization_claims(self, user, tokens):
+        access = AccessToken(tokens['access'])
+
+        assert access['email'] == user.email
+        assert access['is_superuser'] is False
+        assert 'groups' not in access
+
+    def test_if_deactivated_user_is_rejected_return_401(
+            self, shared_cache, user, tokens, django_capture_on_commit_callbacks):
+        user.is_active = False
+        with django_capture_on_commit_callbacks(execute=True):
+            user.save()
+
+        response = client_with(tokens['access']).get(APPLICATION_DATES_ENDPOINT)
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_if_removed_group_is_seen_return_403(
+            self, shared_cache, user, tokens, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            user.groups.clear()
+
+        response = client_with(tokens['access']).get(APPLICATION_DATES_ENDPOINT)
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_if_refreshed_token_has_current_claims_return_200(
+            self, shared_cache, user, tokens, django_capture_on_commit_callbacks):
+        with django_capture_on_commit_callbacks(execute=True):
+            user.groups.clear()
+
+        response = APIClient().post(REFRESH_ENDPOINT, {'refresh': tokens['refresh']})
+        client = client_with(response.data['access'])
+
+        assert response.status_code == status.HTTP_200_OK
+        with CaptureQueriesContext(connection) as context:
+            assert client.get(APPLICATION_DATES_ENDPOINT).status_code == status.HTTP_403_FORBIDDEN
+        assert user_queries(context) == []
+
+    def test_if_refresh_of_deleted_user_is_rejected_return_401(self, user, tokens):
+        user.delete()
+
+        response = APIClient().post(REFRESH_ENDPOINT, {'refresh': tokens['refresh']})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_if_refresh_of_deactivated_user_is_rejected_return_401(self, user, tokens):
+        user.is_active = False
+        user.save()
+
+        response = APIClient().post(REFRESH_ENDPOINT, {'refresh': tokens['refresh']})
+
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_if_lazy_user_loads_other_fields(self, shared_cache, user, tokens):
+        lazy_user = StatelessJWTAuthentication().get_user(AccessToken(tokens['access']))
+
+        assert lazy_user.pk == user.pk
+        assert 'first_name' in lazy_user.get_deferred_fields()
+        assert lazy_user.first_name == 'a'
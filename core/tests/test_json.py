@@ -0,0 +1,78 @@
+import io
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+from core.serializers import FloatDecimalField
+
+DATA = {
+    'salary': Decimal('1250.50'),
+    'cgpa': Decimal('3.45'),
+    'apply_at': datetime(2024, 3, 1, 9, 30, 15, 120, tzinfo=timezone.utc),
+    'birth_date': date(1998, 5, 17),
+    'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+    'duration': timedelta(minutes=5),
+    'status': gettext_lazy('Under review'),
+    'county': 'Grand Cape Mount',
+    'name': 'Kɔlie',
+    'contacts': [{'id': 1, 'phone': '0770000000'}],
+    'counts': {1: 2},
+    'exit_date': None,
+}
+
+
+class TestORJSONRenderer:
+    def test_if_output_matches_json_renderer_return_same_bytes(self):
+        assert ORJSONRenderer().render(DATA) == JSONRenderer().render(DATA)
+
+    def test_if_indent_is_asked_return_indented_json(self):
+        content = ORJSONRenderer().render({'a': 1}, 'application/json; indent=4')
+
+        assert content == b'{\n  "a": 1\n}'
+
+    def test_if_data_is_none_return_empty_body(self):
+        assert ORJSONRenderer().render(None) == b''
+
+
+class TestORJSONParser:
+    def test_if_json_is_valid_return_same_data_as_json_parser(self):
+        content = JSONRenderer().render(DATA)
+
+        assert ORJSONParser().parse(io.BytesIO(content)) == JSONParser().parse(io.BytesIO(content))
+
+    def test_if_json_is_invalid_raise_parse_error(self):
+        with pytest.raises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"cgpa": }'))
+
+
+@pytest.mark.django_db
+class TestJSONSettings:
+    def test_if_invalid_json_is_posted_return_400(self, superuser_client):
+        response = superuser_client.post('/recruitment/application-dates/', '{"open_date": ',
+                                         content_type='application/json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response['Content-Type'] == 'application/json'
+
+
+class TestFloatDecimalField:
+    def test_if_decimal_is_serialized_return_float(self):
+        field = FloatDecimalField(max_digits=3, decimal_places=2)
+
+        assert field.to_representation(Decimal('3.45')) == 3.45
+        assert ORJSONRenderer().render({'cgpa': field.to_representation(Decimal('3.45'))}) == \
+            JSONRenderer().render({'cgpa': Decimal('3.45')})
+
+    def test_if_coerced_to_string_return_string(self):
+        field = FloatDecimalField(max_digits=3, decimal_places=2, coerce_to_string=True)
+
+        assert field.to_representation(Decimal('3.45')) == '3.45'
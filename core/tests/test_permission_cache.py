@@ -0,0 +1,152 @@
+import pytest
+from django.contrib.auth.models import Group, Permission
+from django.core.cache.backends.filebased import FileBasedCache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from core.models import User
+from core.permissions import permissions_version
+
+APPLICATION_DATES_ENDPOINT = '/recruitment/application-dates/'
+
+
+def permission_queries(context):
+    return [query for query in context.captured_queries
+            if 'auth_permission' in query['sql']]
+
+
+@pytest.fixture
+def view_permission():
+    return Permission.objects.get(codename='view_applicationdate')
+
+
+class UserClient(APIClient):
+    """ Authenticates a fresh User per request like the JWT authentication does """
+
+    def __init__(self, user):
+        super().__init__()
+        self.user = user
+
+    def get(self, *args, **kwargs):
+        self.force_authenticate(user=User.objects.get(pk=self.user.pk))
+        return super().get(*args, **kwargs)
+
+
+@pytest.fixture
+def user_client():
+    return UserClient(baker.make(User))
+
+
+@pytest.mark.django_db
+class TestPermissionCache:
+    """
+    If you don't want field validation use Model Baker else add the fields manually.
+    baker.make(User, email='mecom'), Baker considers the email as valid.
+    """
+
+    def test_if_permissions_are_read_once_return_200(self, shared_cache, user_client, view_permission):
+        group = baker.make(Group)
+        group.permissions.add(view_permission)
+        user_client.user.groups.add(group)
+        user_client.get(APPLICATION_DATES_ENDPOINT)
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(APPLICATION_DATES_ENDPOINT)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert permission_queries(context) == []
+
+    def test_if_per_process_cache_reads_permissions_every_time_return_200(self, user_client, view_permission):
+        group = baker.make(Group)
+        group.permissions.add(view_permission)
+        user_client.user.groups.add(group)
+        user_client.get(APPLICATION_DATES_ENDPOINT)
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.get(APPLICATION_DATES_ENDPOINT)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert permission_queries(context) != []
+
+    def test_if_revoke_in_another_worker_is_seen_return_403(
+            self, shared_cache, monkeypatch, user_client, view_permission, django_capture_on_commit_callbacks):
+        group = baker.make(Group)
+        group.permissions.add(view_permission)
+        user_client.user.groups.add(group)
+        worker, other_worker = FileBasedCache(str(shared_cache), {}), FileBasedCache(str(shared_cache), {})
+
+        def run_on(backend):
+            monkeypatch.setattr('core.cache.cache', backend)
+            monkeypatch.setattr('core.permissions.cache', backend)
+
+        run_on(worker)
+        assert user_client.get(APPLICATION_DATES_ENDPOINT).status_code == status.HTTP_200_OK
+        version = permissions_version(user_client.user.pk)
+        run_on(other_worker)
+        with django_capture_on_commit_callbacks(execute=True):
+            user_client.user.groups.remove(group)
+        run_on(worker)
+
+        assert permissions_version(user_client.user.pk) != version
+        assert user_client.get(APPLICATION_DATES_ENDPOINT).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_if_permissions_version_is_bumped_after_commit(
+            self, shared_cache, user_client, view_permission, django_capture_on_commit_callbacks):
+        group = baker.make(Group)
+        group.permissions.add(view_permission)
+        user_client.user.groups.add(group)
+        version = permissions_version(user_client.user.pk)
+        with django_capture_on_commit_callbacks() as callbacks:
+            user_client.user.groups.remove(group)
+            # A request reading before the COMMIT still sees the group,
+            # it must not cache that under a new version
+            assert permissions_version(user_client.user.pk) == version
+
+        for callback in callbacks:
+            callback()
+
+        assert permissions_version(user_client.user.pk) != version
+        assert user_client.get(APPLICATION_DATES_ENDPOINT).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_if_group_permission_change_is_seen_return_200(self, user_client, superuser_client, view_permission):
+        group = baker.make(Group)
+        user_client.user.groups.add(group)
+        assert user_client.get(APPLICATION_DATES_ENDPOINT).status_code == status.HTTP_403_FORBIDDEN
+
+        superuser_client.patch(f'/core/groups/{group.pk}/',
+                               {'permission_ids_to_add': [view_permission.pk]}, format='json')
+
+        assert user_client.get(APPLICATION_DATES_ENDPOINT).status_code == status.HTTP_200_OK
+
+    def test_if_removed_group_is_seen_return_403(self, user_client, superuser_client, view_permission):
+        group = baker.make(Group)
+        group.permissions.add(view_permission)
+        user_client.user.groups.add(group)
+        assert user_client.get(APPLICATION_DATES_ENDPOINT).status_code == status.HTTP_200_OK
+
+        superuser_client.patch(f'/core/users/{user_client.user.pk}/',
+                               {'group_to_remove_ids': [group.pk]}, format='json')
+
+        assert user_client.get(APPLICATION_DATES_ENDPOINT).status_code == status.HTTP_403_FORBIDDEN
+
+    def test_if_user_added_from_group_side_is_seen_return_200(self, user_client, view_permission):
+        group = baker.make(Group)
+        group.permissions.add(view_permission)
+        assert user_client.get(APPLICATION_DATES_ENDPOINT).status_code == status.HTTP_403_FORBIDDEN
+
+        group.user_set.add(user_client.user)
+
+        assert user_client.get(APPLICATION_DATES_ENDPOINT).status_code == status.HTTP_200_OK
+
+    def test_if_deleted_group_is_seen_return_403(self, user_client, view_permission):
+        group = baker.make(Group)
+        group.permissions.add(view_permission)
+        user_client.user.groups.add(group)
+        assert user_client.get(APPLICATION_DATES_ENDPOINT).status_code == status.HTTP_200_OK
+
+        group.delete()
+
+        assert user_client.get(APPLICATION_DATES_ENDPOINT).status_code == status.HTTP_403_FORBIDDEN
@@ -5,6 +5,7 @@ from rest_framework.generics import ListAPIView
 from rest_framework import status
 
 from . import permissions
+from . mixins import VersionedCacheMixin
 from . models import User
 from . import serializers
 
@@ -42,8 +43,9 @@ class GroupViewSet(ModelViewSet):
                 return Response({'detail': 'Group name updated successfully'}, status=status.HTTP_200_OK)
 
 
-class PermissionViewSet(ModelViewSet):
+class PermissionViewSet(VersionedCacheMixin, ModelViewSet):
     http_method_names = ['get', 'post']
+    cache_namespace = permissions.PERMISSION_CATALOG_CACHE_NAMESPACE
     excluded_ids = [1, 2, 3, 4, 13, 14, 15, 16, 17, 18, 19, 20]
     queryset = Permission.objects.exclude(id__in=excluded_ids)
     serializer_class = serializers.PermissionSerializer
@@ -136,6 +136,36 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# The size limits are enforced while the upload is read, before the
+# default handlers spool it [recruitment/upload_handlers.py]
+FILE_UPLOAD_HANDLERS = [
+    'recruitment.upload_handlers.FieldSizeLimitUploadHandler',
+    'django.core.files.uploadhandler.MemoryFileUploadHandler',
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Cached data is invalidated by bumping a version [core/cache.py], the
+# workers have to share the cache or one keeps serving what another one
+# has invalidated. Set REDIS_URL when running several workers, with the
+# per-process LocMemCache the permissions aren't cached and the access
+# token claims aren't trusted [core/permissions.py, core/authentication.py].
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -152,11 +182,20 @@ INTERNAL_IPS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'core.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'core.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'core.parsers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'recruitment.upload_handlers.SizeLimitedMultiPartParser',
+    ),
     'COERCE_DECIMAL_TO_STRING': False,
 }
 
@@ -164,6 +203,9 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(days=2),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=3),
     "AUTH_HEADER_TYPES": ('JWT',), 
+    # Access tokens carry the user's authorization [core/authentication.py]
+    "TOKEN_OBTAIN_SERIALIZER": 'core.serializers.AuthorizationTokenObtainPairSerializer',
+    "TOKEN_REFRESH_SERIALIZER": 'core.serializers.AuthorizationTokenRefreshSerializer',
 }
 
 DJOSER = {
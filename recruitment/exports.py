@@ -0,0 +1,162 @@
+import csv
+import os
+import re
+import zipfile
+from decimal import Decimal
+from xml.sax.saxutils import escape
+
+from .models import ApplicantDocument
+from .streaming import Echo, zip_stream
+
+EXPORT_CHUNK_SIZE = 500
+FILE_CHUNK_SIZE = 64 * 1024
+
+# Header -> how to read it from an Applicant with its user, document,
+# address and contacts loaded. A missing document/address gives ''.
+APPLICANT_EXPORT_COLUMNS = [
+    ('ID number', lambda app: app.id_number),
+    ('First name', lambda app: app.user.first_name),
+    ('Last name', lambda app: app.user.last_name),
+    ('Email', lambda app: app.user.email),
+    ('Gender', lambda app: app.gender),
+    ('Religion', lambda app: app.religion),
+    ('Birth date', lambda app: app.birth_date.isoformat()),
+    ('Birth county', lambda app: app.county),
+    ('Status', lambda app: app.status),
+    ('Rejection reason', lambda app: app.rejection_reason or ''),
+    ('Applied at', lambda app: app.apply_at.isoformat()),
+    ('Qualification', lambda app: _related(app, 'document', 'qualification')),
+    ('Graduation year', lambda app: _related(app, 'document', 'graduation_year')),
+    ('Major', lambda app: _related(app, 'document', 'major')),
+    ('Minor', lambda app: _related(app, 'document', 'manor')),
+    ('Institution', lambda app: _related(app, 'document', 'institution')),
+    ('Institution country', lambda app: _related(app, 'document', 'country')),
+    ('Institution county', lambda app: _related(app, 'document', 'county')),
+    ('CGPA', lambda app: _related(app, 'document', 'cgpa')),
+    ('Country', lambda app: _related(app, 'address', 'country')),
+    ('County', lambda app: _related(app, 'address', 'county')),
+    ('District', lambda app: _related(app, 'address', 'district')),
+    ('Community', lambda app: _related(app, 'address', 'community')),
+    ('House address', lambda app: _related(app, 'address', 'house_address')),
+    ('Phones', lambda app: '; '.join(
+        contact.phone for contact in app.contacts.all())),
+]
+
+
+def _related(applicant, relation, field):
+    related = getattr(applicant, relation, None)
+    return getattr(related, field) if related is not None else ''
+
+
+def applicant_rows(queryset):
+    """
+    Header then one flat row per applicant. The queryset is read with
+    iterator(chunk_size) so only one chunk of applicants [and their
+    prefetched contacts] is in memory at a time.
+    """
+    yield [header for header, _ in APPLICANT_EXPORT_COLUMNS]
+    for applicant in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield [value(applicant) for _, value in APPLICANT_EXPORT_COLUMNS]
+
+
+def csv_stream(rows):
+    writer = csv.writer(Echo())
+    for row in rows:
+        yield writer.writerow(row)
+
+
+# Minimal SpreadsheetML package, the worksheet is the only streamed part.
+XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+XLSX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="{sheet_name}" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+    '</Relationships>'
+)
+XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<sheetData>'
+)
+XLSX_SHEET_END = '</sheetData></worksheet>'
+
+# XML 1.0 doesn't allow these even escaped
+ILLEGAL_XML_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+
+def _xlsx_cell(value):
+    if value is None:
+        return '<c/>'
+    if isinstance(value, (int, float, Decimal)) and not isinstance(value, bool):
+        return f'<c><v>{value}</v></c>'
+    text = escape(ILLEGAL_XML_CHARS.sub('', str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_sheet(rows):
+    yield XLSX_SHEET_START.encode()
+    for row in rows:
+        yield f'<row>{"".join(_xlsx_cell(value) for value in row)}</row>'.encode()
+    yield XLSX_SHEET_END.encode()
+
+
+def xlsx_stream(rows, sheet_name='Applicants'):
+    """ An .xlsx is a zip of XML parts, the worksheet is written row by row """
+    return zip_stream([
+        ('[Content_Types].xml', [XLSX_CONTENT_TYPES.encode()]),
+        ('_rels/.rels', [XLSX_RELS.encode()]),
+        ('xl/workbook.xml', [XLSX_WORKBOOK.format(sheet_name=sheet_name).encode()]),
+        ('xl/_rels/workbook.xml.rels', [XLSX_WORKBOOK_RELS.encode()]),
+        ('xl/worksheets/sheet1.xml', _xlsx_sheet(rows)),
+    ])
+
+
+def _file_chunks(field_file):
+    """ Read a stored file FILE_CHUNK_SIZE at a time, closing it at the end """
+    with field_file.open('rb') as file:
+        yield from file.chunks(FILE_CHUNK_SIZE)
+
+
+def document_archive_entries(documents):
+    """
+    (archive name, chunks) of every file of the ApplicantDocuments, one
+    folder per applicant. Files missing from the storage are skipped.
+    """
+    for document in documents.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        folder = f'{document.applicant.id_number}-{document.applicant_id}'
+        for field in ApplicantDocument.FILE_FIELDS:
+            field_file = getattr(document, field)
+            if not field_file or not field_file.storage.exists(field_file.name):
+                continue
+            _, extension = os.path.splitext(field_file.name)
+            yield f'{folder}/{field}{extension}', _file_chunks(field_file)
+
+
+def documents_zip_stream(documents):
+    """ PDFs are already compressed, they're stored as is to save CPU """
+    return zip_stream(document_archive_entries(documents), compression=zipfile.ZIP_STORED)
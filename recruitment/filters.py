@@ -1,12 +1,58 @@
-from django_filters.rest_framework import FilterSet
+from django.db.models import Count, Q
+from django_filters.rest_framework import FilterSet, MultipleChoiceFilter
 from . import models
 
+# Choice fields of the employee directory, see EmployeeFilter.facet_counts
+EMPLOYEE_FACETS = {
+    'religion': models.Employee.RELIGION_CHOICES,
+    'gender': models.Employee.GENDER_CHOICES,
+    'qualification': models.Employee.QUALIFICATION_CHOICES,
+    'employment': models.Employee.EMPLOYMENT_CHOICES,
+    'county': models.Employee.COUNTY_CHOICES,
+}
+
+
 class EmployeeFilter(FilterSet):
-    """ Filtering by both fields and related models"""
+    """
+    Filtering by both fields and related models. The choice fields are
+    exact matches, repeat one for any of several values
+    [?religion=Christian&religion=Muslim], see Employee.Meta.indexes.
+    """
+    religion = MultipleChoiceFilter(choices=EMPLOYEE_FACETS['religion'])
+    gender = MultipleChoiceFilter(choices=EMPLOYEE_FACETS['gender'])
+    qualification = MultipleChoiceFilter(choices=EMPLOYEE_FACETS['qualification'])
+    employment = MultipleChoiceFilter(choices=EMPLOYEE_FACETS['employment'])
+    county = MultipleChoiceFilter(choices=EMPLOYEE_FACETS['county'])
+
     class Meta:
         model = models.Employee
         fields = {
             'supervisor': ['exact'],
             'user': ['exact'],
-            'county': ['exact'],
         }
+
+    def facet_counts(self):
+        """
+        Count of every value of every EMPLOYEE_FACETS field, 0 included,
+        in a single query. A field is counted under all the filters but
+        its own so the other values of a selected field keep their count.
+        """
+        queryset = self.queryset
+        for name, value in self.form.cleaned_data.items():
+            if name not in EMPLOYEE_FACETS:
+                queryset = self.filters[name].filter(queryset, value)
+
+        selected = {field: Q(**{f'{field}__in': self.form.cleaned_data[field]})
+                    for field in EMPLOYEE_FACETS if self.form.cleaned_data.get(field)}
+        aggregates = {}
+        for field, choices in EMPLOYEE_FACETS.items():
+            other_filters = Q(*[condition for name, condition in selected.items() if name != field])
+            # The values have spaces, they can't be column aliases
+            for index, (value, _) in enumerate(choices):
+                aggregates[f'{field}_{index}'] = Count(
+                    'pk', filter=Q(**{field: value}) & other_filters)
+
+        counts = queryset.order_by().aggregate(**aggregates)
+        return {field: [{'value': value, 'count': counts[f'{field}_{index}']}
+                        for index, (value, _) in enumerate(choices)]
+                for field, choices in EMPLOYEE_FACETS.items()}
@@ -0,0 +1,85 @@
+"""
+Job queue on the database, no broker to run. A request enqueues the slow
+part of its work [thumbnails, file checks, cleanup] and returns, the
+'run_jobs' command runs it in a process pool:
+
+    @task
+    def create_thumbnails(model, pk): ...
+
+    enqueue('create_thumbnails', model='recruitment.applicant', pk=1)
+
+The payload is stored as JSON so pass ids and names, not instances.
+"""
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+MAX_ATTEMPTS = 3
+RETRY_DELAY = timedelta(seconds=30)
+# A Running job claimed longer ago than this lost its worker [killed,
+# broken pool] and is claimed again. Keep it above the slowest task.
+LEASE = timedelta(minutes=10)
+
+TASKS = {}
+
+
+def task(function):
+    """ Register 'function' to be run by the workers under its name """
+    TASKS[function.__name__] = function
+    return function
+
+
+def enqueue(task_name, **payload):
+    if task_name not in TASKS:
+        raise KeyError(f"'{task_name}' isn't a registered task.")
+    return Job.objects.create(task=task_name, payload=payload)
+
+
+def claim_jobs(limit):
+    """
+    Mark up to 'limit' due jobs as Running and return their ids, the
+    Running jobs whose LEASE expired included. The claim counts as an
+    attempt so a job that keeps killing its worker ends up Failed. The
+    status and claimed_at are checked again in the UPDATE so two workers
+    polling at the same time can't claim the same job.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(Job.objects.select_for_update(skip_locked=True).filter(
+            Q(status='Pending', run_after__lte=now) | Q(status='Running', claimed_at__lte=now - LEASE)
+        ).order_by('run_after').values_list('id', 'status', 'claimed_at', 'attempts')[:limit])
+        claimed = []
+        for job_id, job_status, claimed_at, attempts in rows:
+            job = Job.objects.filter(id=job_id, status=job_status, claimed_at=claimed_at)
+            if attempts >= MAX_ATTEMPTS:
+                job.update(status='Failed', last_error='The worker running it stopped.')
+            elif job.update(status='Running', claimed_at=now, attempts=F('attempts') + 1):
+                claimed.append(job_id)
+    return claimed
+
+
+def run_job(job_id):
+    """
+    Run a claimed job. A failed one is retried after RETRY_DELAY times
+    its attempts until MAX_ATTEMPTS.
+    """
+    job = Job.objects.get(pk=job_id)
+    try:
+        with transaction.atomic():
+            TASKS[job.task](**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        if job.attempts < MAX_ATTEMPTS:
+            job.status = 'Pending'
+            job.run_after = timezone.now() + RETRY_DELAY * job.attempts
+        else:
+            job.status = 'Failed'
+    else:
+        job.status = 'Done'
+    job.save(update_fields=['status', 'run_after', 'last_error'])
+    return job.status
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from recruitment.jobs import enqueue
+from recruitment.models import Applicant, Employee, Pyp
+
+
+class Command(BaseCommand):
+    help = ('Enqueue a create_thumbnails job for every person image without '
+            'thumbnails [recruitment/thumbnails.py], e.g. uploaded before they existed.')
+
+    def handle(self, *args, **options):
+        count = 0
+        with transaction.atomic():
+            for model in (Applicant, Employee, Pyp):
+                person_ids = model.objects.filter(has_thumbnails=False).exclude(
+                    image='').values_list('pk', flat=True)
+                for pk in list(person_ids):
+                    enqueue('create_thumbnails', model=model._meta.label_lower, pk=pk)
+                    count += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'{count} create_thumbnails jobs enqueued, run them with run_jobs.'))
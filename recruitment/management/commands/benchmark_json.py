@@ -0,0 +1,87 @@
+import io
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core.models import User
+from core.parsers import ORJSONParser
+from core.renderers import ORJSONRenderer
+from recruitment.models import Applicant, ApplicantAddress, ApplicantContact, ApplicantDocument
+from recruitment.serializers import ReadApplicantSerializer
+
+PAIRS = [('json', JSONRenderer(), JSONParser()),
+         ('orjson', ORJSONRenderer(), ORJSONParser())]
+
+
+def make_applicant(pk):
+    """ An Applicant with its relations as a list page loads them, no DB involved """
+    user = User(id=pk, first_name='Comfort', last_name='Kollie',
+                email=f'applicant{pk}@example.com')
+    applicant = Applicant(
+        user=user, birth_date=date(1998, 5, 17), gender='Female', religion='Christian',
+        county='Montserrado', image=f'recruitment/images/{pk}.jpg',
+        id_number=f'APP{pk:06d}', status='Under review')
+    applicant.document = ApplicantDocument(
+        qualification='BSc', graduation_year=2020, major='Computer Science',
+        manor='Mathematics', institution='University of Liberia', country='Liberia',
+        county='Montserrado', cgpa=Decimal('3.45'),
+        **{field: f'recruitment/blobs/{pk}-{field}.pdf' for field in ApplicantDocument.FILE_FIELDS})
+    applicant.address = ApplicantAddress(
+        country='Liberia', county='Montserrado', district=7,
+        community='Sinkor', house_address='15th Street')
+
+    contacts = ApplicantContact.objects.all()
+    contacts._result_cache = [ApplicantContact(id=pk * 2 + index, applicant=applicant,
+                                               phone=f'0770{pk:06d}{index}') for index in range(2)]
+    contacts._prefetch_done = True
+    applicant._prefetched_objects_cache = {'contacts': contacts}
+    return applicant
+
+
+def with_decimals(data):
+    """ The rows as they were before FloatDecimalField, cgpa as a Decimal """
+    return [{**row, 'document': {**row['document'], 'cgpa': Decimal(str(row['document']['cgpa']))}}
+            for row in data]
+
+
+def best_time(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    help = ('Compare the default JSON renderer/parser with the orjson ones '
+            '[core/renderers.py] on ReadApplicantSerializer data. The '
+            '"orjson/Decimal" row renders the same rows with cgpa as a Decimal, '
+            'what the default callback costs.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 50000])
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Runs per measure, the best one is reported.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f'{"rows":>8} {"library":>14} {"render ms":>10} {"parse ms":>10} {"KB":>8}')
+        for rows in options['rows']:
+            data = ReadApplicantSerializer(
+                [make_applicant(pk) for pk in range(1, rows + 1)], many=True).data
+
+            for name, renderer, parser in PAIRS:
+                content = renderer.render(data)
+                render_time = best_time(lambda: renderer.render(data), options['repeat'])
+                parse_time = best_time(lambda: parser.parse(io.BytesIO(content)), options['repeat'])
+                self.stdout.write(f'{rows:>8} {name:>14} {render_time * 1000:>10.1f} '
+                                  f'{parse_time * 1000:>10.1f} {len(content) / 1024:>8.0f}')
+
+            renderer = ORJSONRenderer()
+            decimal_data = with_decimals(data)
+            render_time = best_time(lambda: renderer.render(decimal_data), options['repeat'])
+            self.stdout.write(f'{rows:>8} {"orjson/Decimal":>14} {render_time * 1000:>10.1f}')
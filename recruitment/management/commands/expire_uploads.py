@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from recruitment.uploads import UPLOAD_EXPIRY, expire_uploads
+
+
+class Command(BaseCommand):
+    help = ('Remove the document uploads [recruitment/uploads.py] not attached '
+            'UPLOAD_EXPIRY after they started, and their partial files.')
+
+    def handle(self, *args, **options):
+        upload_count, orphan_count = expire_uploads(UPLOAD_EXPIRY)
+        self.stdout.write(self.style.SUCCESS(
+            f'{upload_count} expired uploads and {orphan_count} orphan partial files removed.'))
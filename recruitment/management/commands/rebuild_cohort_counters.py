@@ -0,0 +1,12 @@
+from django.core.management.base import BaseCommand
+
+from recruitment.models import Cohort
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the Cohort rejection counters from the Unsuccessful Screenings.'
+
+    def handle(self, *args, **options):
+        Cohort.rebuild_rejection_counters()
+        self.stdout.write(self.style.SUCCESS(
+            'Cohort rejection counters rebuilt.'))
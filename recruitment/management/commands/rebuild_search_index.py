@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from recruitment import search
+from recruitment.models import Applicant
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the applicants full text index [recruitment/search.py].'
+
+    def handle(self, *args, **options):
+        search.drop_search_index()
+        search.create_search_index(Applicant)
+        if search.search_available():
+            self.stdout.write(self.style.SUCCESS('Applicants search index rebuilt.'))
+        else:
+            self.stdout.write(self.style.WARNING(
+                'Full text search is not supported on this database.'))
@@ -0,0 +1,52 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from recruitment.jobs import claim_jobs, run_job
+
+
+def setup_worker():
+    """ Runs in each pool process, a forked process can't reuse the parent connection """
+    django.setup()
+    connections.close_all()
+
+
+class Command(BaseCommand):
+    help = 'Run the pending background jobs [recruitment/jobs.py] in a process pool.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                            help='Pool processes, 0 runs the jobs in this process.')
+        parser.add_argument('--batch', type=int, default=20,
+                            help='Jobs claimed per poll.')
+        parser.add_argument('--sleep', type=float, default=1.0,
+                            help='Seconds to wait when there is no job.')
+        parser.add_argument('--once', action='store_true',
+                            help='Exit when there is no pending job left.')
+
+    def handle(self, *args, **options):
+        if options['workers'] == 0:
+            self.poll(map, options)
+            return
+
+        # The pool processes are forked, they must not share our connection
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=options['workers'],
+                                 initializer=setup_worker) as pool:
+            self.poll(pool.map, options)
+
+    def poll(self, run, options):
+        while True:
+            job_ids = claim_jobs(options['batch'])
+            if not job_ids:
+                if options['once']:
+                    return
+                time.sleep(options['sleep'])
+                continue
+
+            for job_id, job_status in zip(job_ids, run(run_job, job_ids)):
+                self.stdout.write(f'Job {job_id}: {job_status}')
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:17
+
+from django.db import migrations, models
+from django.db.models import BigIntegerField, Max
+from django.db.models.functions import Cast
+
+
+def seed_id_number_sequences(apps, schema_editor):
+    """ Start each counter from the biggest numeric id_number """
+    IdNumberSequence = apps.get_model('recruitment', 'IdNumberSequence')
+    for name in ['Applicant', 'Pyp']:
+        model = apps.get_model('recruitment', name)
+        latest_number = model.objects.aggregate(
+            latest=Max(Cast('id_number', BigIntegerField())))['latest']
+        IdNumberSequence.objects.create(
+            name=name, last_value=latest_number or 0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0016_applicant_apply_at_user_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdNumberSequence',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('last_value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(seed_id_number_sequences,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0017_idnumbersequence'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['application_date', 'status'], name='applicant_date_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(condition=models.Q(('status__in', ['Under review', 'Pending'])), fields=['status'], name='applicant_screening_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationdate',
+            index=models.Index(fields=['-open_date'], name='appdate_open_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationdate',
+            index=models.Index(condition=models.Q(('is_current', True)), fields=['is_current'], name='appdate_current_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationstage',
+            index=models.Index(fields=['application_date', 'order'], name='stage_date_order_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicationstage',
+            index=models.Index(condition=models.Q(('is_current', True)), fields=['application_date'], name='stage_current_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='screening',
+            index=models.Index(fields=['stage', 'applicant'], name='screening_stage_applicant_idx'),
+        ),
+    ]
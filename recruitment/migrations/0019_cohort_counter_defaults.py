@@ -0,0 +1,77 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:21
+
+from django.db import migrations, models
+
+
+def rebuild_rejection_counters(apps, schema_editor):
+    """ The counters were never maintained, count them from the Screenings """
+    from recruitment.models import Cohort
+
+    Cohort.rebuild_rejection_counters(apps.get_model('recruitment', 'Cohort'),
+                                      apps.get_model('recruitment', 'Screening'))
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0018_recruitment_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='cohort',
+            name='rejected_diploma_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='cohort',
+            name='rejected_exams_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='cohort',
+            name='rejected_female_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='cohort',
+            name='rejected_interview_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='cohort',
+            name='rejected_job_readiness_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='cohort',
+            name='rejected_male_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='cohort',
+            name='rejected_national_id_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='cohort',
+            name='rejected_police_clearance_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='cohort',
+            name='rejected_transcript',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='cohort',
+            name='rejection_absent_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='cohort',
+            name='rejection_other_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(rebuild_rejection_counters,
+                             migrations.RunPython.noop),
+    ]
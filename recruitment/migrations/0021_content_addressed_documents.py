@@ -0,0 +1,115 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:31
+
+import django.core.validators
+import recruitment.storage
+import recruitment.utilities
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0020_documentupload'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredBlob',
+            fields=[
+                ('name', models.CharField(max_length=255, primary_key=True, serialize=False)),
+                ('size', models.PositiveBigIntegerField()),
+                ('references', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='applicantdocument',
+            name='application_letter',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.application_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='applicantdocument',
+            name='community_letter',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.community_letter_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='applicantdocument',
+            name='degree',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.degree_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='applicantdocument',
+            name='police_clearance',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.police_clearance_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='applicantdocument',
+            name='reference_letter',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.reference_letter_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='applicantdocument',
+            name='resume',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.resume_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='employeedocument',
+            name='application_letter',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.emp_application_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='employeedocument',
+            name='community_letter',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.emp_community_letter_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='employeedocument',
+            name='degree',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.emp_degree_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='employeedocument',
+            name='reference_letter',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.emp_reference_letter_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='employeedocument',
+            name='resume',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.emp_resume_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='pyp',
+            name='tor',
+            field=models.FileField(blank=True, null=True, storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.tor_upload_path),
+        ),
+        migrations.AlterField(
+            model_name='pypdocument',
+            name='application_letter',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.application_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='pypdocument',
+            name='community_letter',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.community_letter_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='pypdocument',
+            name='degree',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.degree_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='pypdocument',
+            name='police_clearance',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.police_clearance_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='pypdocument',
+            name='reference_letter',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.reference_letter_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+        migrations.AlterField(
+            model_name='pypdocument',
+            name='resume',
+            field=models.FileField(storage=recruitment.storage.get_document_storage, upload_to=recruitment.utilities.resume_upload_path, validators=[django.core.validators.FileExtensionValidator(allowed_extensions=['pdf'])]),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 13:51
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def set_current_stages(apps, schema_editor):
+    """ The last stage [biggest order] each applicant reached """
+    Applicant = apps.get_model('recruitment', 'Applicant')
+    ApplicationStage = apps.get_model('recruitment', 'ApplicationStage')
+    Applicant.objects.update(current_stage=Subquery(
+        ApplicationStage.objects.filter(applicants=OuterRef('pk'))
+        .order_by('-order').values('pk')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0023_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicant',
+            name='current_stage',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='current_applicants', to='recruitment.applicationstage'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['current_stage', 'status'], name='applicant_stage_status_idx'),
+        ),
+        migrations.RunPython(set_current_stages,
+                             migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from recruitment import search
+
+
+def create_search_index(apps, schema_editor):
+    search.create_search_index(apps.get_model('recruitment', 'Applicant'),
+                               using=schema_editor.connection.alias)
+
+
+def drop_search_index(apps, schema_editor):
+    search.drop_search_index(using=schema_editor.connection.alias)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0024_applicant_current_stage'),
+        ('core', '0004_user_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0026_employee_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='screening',
+            name='rejection_reason',
+            field=models.CharField(blank=True, choices=[('Police clearance', 'Police clearance'), ('National ID', 'National ID'), ('Diploma', 'Diploma'), ('Transcript', 'Transcript'), ('Writen exams', 'Written exams'), ('Interview', 'Interview'), ('Job readiness', 'Job readiness'), ('Absent', 'Absent'), ('Document', 'Document'), ('Disorderly conduct', 'Disorderly conduct'), ('Other', 'Other')], max_length=18, null=True),
+        ),
+    ]
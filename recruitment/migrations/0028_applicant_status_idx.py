@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0027_alter_screening_rejection_reason'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='applicant',
+            name='applicant_screening_idx',
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['status'], name='applicant_status_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 14:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recruitment', '0029_job_claimed_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicant',
+            name='has_thumbnails',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='employee',
+            name='has_thumbnails',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='pyp',
+            name='has_thumbnails',
+            field=models.BooleanField(default=False),
+        ),
+    ]
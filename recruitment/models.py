@@ -1,6 +1,15 @@
+import os
+import uuid
+from collections import Counter, defaultdict
 from django.conf import settings
-from django.db import models, transaction
+from django.db import connection, models, transaction
+from django.db.models import Count, F
 from django.core.validators import FileExtensionValidator
+from django.utils import timezone
+
+from core.cache import bump_version_on_commit
+
+from .storage import get_document_storage
 
 from .validators import (
     validate_file_size,
@@ -63,7 +72,12 @@ class Person(CountyChoice):
     religion = models.CharField(max_length=9, choices=RELIGION_CHOICES)
     image = models.ImageField(
         upload_to=image_upload_path, validators=[validate_file_size])
+    # Set by the create_thumbnails job, until then the thumbnail URLs are
+    # the image one [thumbnails.py]
+    has_thumbnails = models.BooleanField(default=False)
     joined_at = models.DateField(auto_now_add=True)
+    # The profile ETags are built from it, see views.ConditionalRetrieveMixin
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         abstract = True
@@ -75,6 +89,13 @@ class ApplicationDate(models.Model):
     close_date = models.DateField()
     is_current = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-open_date'], name='appdate_open_date_idx'),
+            models.Index(fields=['is_current'], condition=models.Q(is_current=True),
+                         name='appdate_current_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         """ 
         Checking for update and create operations b/c this method is 
@@ -96,6 +117,44 @@ class ApplicationDate(models.Model):
 
         return super().save(*args, **kwargs)
 
+    # The dashboard counts are cached under this version, see signals.py
+    DASHBOARD_CACHE_NAMESPACE = 'recruitment-dashboard'
+    # The ApplicationDateViewSet responses are cached under this version
+    CACHE_NAMESPACE = 'application-dates'
+    # Dashboard dimension -> Applicant lookup. 'stage' counts the
+    # applicants that reached each stage of this recruitment.
+    DASHBOARD_DIMENSIONS = {
+        'county': 'county',
+        'gender': 'gender',
+        'religion': 'religion',
+        'qualification': 'document__qualification',
+        'status': 'status',
+        'stage': 'stages__name',
+    }
+
+    def applicant_counts(self):
+        """ Applicant counts of this recruitment by dimension, one GROUP BY per dimension """
+        applicants = self.applicants.order_by()
+        counts = {'application_date': self.pk, 'total': applicants.count()}
+
+        for dimension, lookup in self.DASHBOARD_DIMENSIONS.items():
+            counts[dimension] = [
+                {'value': row[lookup], 'count': row['count']}
+                for row in applicants.values(lookup).annotate(
+                    count=models.Count('pk', distinct=True)).order_by(lookup)
+            ]
+        return counts
+
+
+class IdNumberSequence(models.Model):
+    """
+    Counter behind Applicant.id_number and Pyp.id_number [one row per
+    model], see utilities.next_id_number. 'last_value' is the last
+    number handed out.
+    """
+    name = models.CharField(max_length=50, primary_key=True)
+    last_value = models.PositiveBigIntegerField(default=0)
+
 
 class Applicant(Person):
     id_number = models.CharField(
@@ -105,6 +164,28 @@ class Applicant(Person):
     status = models.CharField(max_length=100, default='Under review')# will be updated when creating an instance of Screening
     rejection_reason = models.CharField(max_length=100, null=True, blank=True)# '', for updating applicant profile at frontend
     apply_at = models.DateTimeField(auto_now_add=True)
+    # Last stage reached, kept with the 'stages' m2m by ApplicantSerializer
+    # and ApplicationStage.add_qualified_applicants so the board doesn't
+    # go through the m2m. Indexed by applicant_stage_status_idx.
+    current_stage = models.ForeignKey(
+        'ApplicationStage', null=True, blank=True, on_delete=models.SET_NULL,
+        related_name='current_applicants', db_index=False)
+
+    class Meta:
+        indexes = [
+            # Backs the cursor pagination of the applicants list
+            models.Index(fields=['apply_at', 'user'],
+                         name='applicant_apply_at_user_idx'),
+            # Promotion to the next stage
+            models.Index(fields=['application_date', 'status'],
+                         name='applicant_date_status_idx'),
+            # Status filters, see test_query_plans. A partial index on the
+            # screened statuses only served the exact IN ('Under review', 'Pending')
+            models.Index(fields=['status'], name='applicant_status_idx'),
+            # Applicants in a stage [qualified applicants board]
+            models.Index(fields=['current_stage', 'status'],
+                         name='applicant_stage_status_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         with transaction.atomic():
@@ -141,6 +222,16 @@ class Employee(Person, QualificationChoice):
     salary = models.DecimalField(max_digits=6, decimal_places=2)
     exit_date = models.DateField(null=True)
 
+    class Meta:
+        # Exact filters of the employee directory [filters.EmployeeFilter]
+        indexes = [
+            models.Index(fields=['religion'], name='employee_religion_idx'),
+            models.Index(fields=['gender'], name='employee_gender_idx'),
+            models.Index(fields=['qualification'], name='employee_qualification_idx'),
+            models.Index(fields=['employment'], name='employee_employment_idx'),
+            models.Index(fields=['county'], name='employee_county_idx'),
+        ]
+
 
 class ApplicationStage(models.Model):
     """
@@ -154,6 +245,8 @@ class ApplicationStage(models.Model):
         ('Job readiness orientation', 'Job readiness orientation'),
         ('Placement', 'Placement')
     )
+    # The ApplicationStageViewSet responses are cached under this version
+    CACHE_NAMESPACE = 'application-stages'
     name = models.CharField(max_length=25, choices=NAME_CHOICES)
     application_date = models.ForeignKey(
         ApplicationDate, on_delete=models.PROTECT, related_name='stages')
@@ -165,6 +258,15 @@ class ApplicationStage(models.Model):
     # recruitments and also open_date has month as well how do I know 
     # the exact month for the current recruitment. 
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['application_date', 'order'],
+                         name='stage_date_order_idx'),
+            models.Index(fields=['application_date'],
+                         condition=models.Q(is_current=True),
+                         name='stage_current_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         """ 
         To know the current stage when creating ApplicationStage instances
@@ -179,6 +281,48 @@ class ApplicationStage(models.Model):
 
             return super().save(*args, **kwargs)
 
+    def add_qualified_applicants(self, excluded_statuses=('Unsuccessful', 'Under review')):
+        """
+        Add the qualified applicants of this stage's ApplicationDate with
+        a single INSERT ... SELECT into the 'applicants' through table,
+        so previous recruitments are never scanned and nothing is loaded
+        in Python. Applicants already in this stage are skipped.
+        m2m_changed is NOT sent for these rows. Their current_stage is
+        moved to this stage with one UPDATE.
+        """
+        through = self.applicants.through._meta
+        applicant = Applicant._meta
+        qn = connection.ops.quote_name
+
+        through_table = qn(through.db_table)
+        stage_column = qn(through.get_field('applicationstage').column)
+        applicant_column = qn(through.get_field('applicant').column)
+        status_placeholders = ', '.join(['%s'] * len(excluded_statuses))
+
+        sql = f"""
+            INSERT INTO {through_table} ({stage_column}, {applicant_column})
+            SELECT %s, app.{qn(applicant.pk.column)}
+            FROM {qn(applicant.db_table)} app
+            WHERE app.{qn(applicant.get_field('application_date').column)} = %s
+              AND app.{qn(applicant.get_field('status').column)} NOT IN ({status_placeholders})
+              AND NOT EXISTS (
+                SELECT 1 FROM {through_table} st
+                WHERE st.{stage_column} = %s
+                  AND st.{applicant_column} = app.{qn(applicant.pk.column)})
+        """
+        params = [self.pk, self.application_date_id, *excluded_statuses, self.pk]
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                promoted_count = cursor.rowcount
+
+            Applicant.objects.filter(application_date_id=self.application_date_id).exclude(
+                status__in=excluded_statuses).update(current_stage=self)
+
+        bump_version_on_commit(ApplicationDate.DASHBOARD_CACHE_NAMESPACE)
+        return promoted_count
+
 
 class Screening(models.Model):
     """ Return instances associated with the requested status """
@@ -214,6 +358,24 @@ class Screening(models.Model):
         Employee, on_delete=models.PROTECT, null=True, blank=True, related_name='screenings')#nullable b/c when applicants themselvies are registering I've to automatically add them to this model for feather processing later by an employee but at this point I don't want to say they're process by employee 1
     process_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['stage', 'applicant'],
+                         name='screening_stage_applicant_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """ The Cohort rejection counters are updated in the same transaction """
+        with transaction.atomic():
+            is_rejection = self._state.adding and self.status == 'Unsuccessful'
+            super().save(*args, **kwargs)
+
+            if is_rejection:
+                applicant = Applicant.objects.values(
+                    'application_date_id', 'gender').get(pk=self.applicant_id)
+                Cohort.record_rejections([(
+                    applicant['application_date_id'], applicant['gender'], self.rejection_reason)])
+
 
 # Use the 'pre_save and post_save' signals of ApplicationStage
 # class ApplicantStatusAuditTrial(models.Model):
@@ -252,18 +414,105 @@ class Cohort(models.Model):
     # ApplicationStage.name == 'placement' of the current
     # ApplicationDate and them make the previous PYP old
     is_currnt = models.BooleanField(default=True)
-    # auto all the below fields from 'RejectedApplication'
-    rejected_male_count = models.PositiveIntegerField()
-    rejected_female_count = models.PositiveIntegerField()
-    rejected_police_clearance_count = models.PositiveIntegerField()
-    rejected_national_id_count = models.PositiveIntegerField()
-    rejected_diploma_count = models.PositiveIntegerField()
-    rejected_transcript = models.PositiveIntegerField()
-    rejected_exams_count = models.PositiveIntegerField()
-    rejected_interview_count = models.PositiveIntegerField()
-    rejected_job_readiness_count = models.PositiveIntegerField()
-    rejection_absent_count = models.PositiveIntegerField()
-    rejection_other_count = models.PositiveIntegerField()
+    # The below fields are maintained from the 'Unsuccessful' Screenings
+    # of the cohort ApplicationDate, see 'record_rejections'.
+    rejected_male_count = models.PositiveIntegerField(default=0)
+    rejected_female_count = models.PositiveIntegerField(default=0)
+    rejected_police_clearance_count = models.PositiveIntegerField(default=0)
+    rejected_national_id_count = models.PositiveIntegerField(default=0)
+    rejected_diploma_count = models.PositiveIntegerField(default=0)
+    rejected_transcript = models.PositiveIntegerField(default=0)
+    rejected_exams_count = models.PositiveIntegerField(default=0)
+    rejected_interview_count = models.PositiveIntegerField(default=0)
+    rejected_job_readiness_count = models.PositiveIntegerField(default=0)
+    rejection_absent_count = models.PositiveIntegerField(default=0)
+    rejection_other_count = models.PositiveIntegerField(default=0)
+
+    GENDER_COUNTERS = {
+        'Male': 'rejected_male_count',
+        'Female': 'rejected_female_count',
+    }
+    # 'Document', 'Disorderly conduct', 'Other' and no reason go to 'rejection_other_count'
+    REJECTION_REASON_COUNTERS = {
+        'Police clearance': 'rejected_police_clearance_count',
+        'National ID': 'rejected_national_id_count',
+        'Diploma': 'rejected_diploma_count',
+        'Transcript': 'rejected_transcript',
+        'Writen exams': 'rejected_exams_count',
+        'Interview': 'rejected_interview_count',
+        'Job readiness': 'rejected_job_readiness_count',
+        'Absent': 'rejection_absent_count',
+    }
+    COUNTER_FIELDS = [*GENDER_COUNTERS.values(), *REJECTION_REASON_COUNTERS.values(),
+                      'rejection_other_count']
+
+    def save(self, *args, **kwargs):
+        """ A new cohort starts from the rejections its recruitment already has """
+        with transaction.atomic():
+            if self._state.adding:
+                counters = Cohort.count_rejections(
+                    application_date_id=self.application_date_id)
+                for field, count in counters.get(self.application_date_id, {}).items():
+                    setattr(self, field, count)
+
+            return super().save(*args, **kwargs)
+
+    @classmethod
+    def rejection_counters(cls, gender, rejection_reason):
+        """ The counter fields one rejected applicant increments """
+        counters = [cls.REJECTION_REASON_COUNTERS.get(
+            rejection_reason, 'rejection_other_count')]
+        if gender in cls.GENDER_COUNTERS:
+            counters.append(cls.GENDER_COUNTERS[gender])
+        return counters
+
+    @classmethod
+    def record_rejections(cls, rejections):
+        """
+        rejections: [(application_date_id, gender, rejection_reason), ...]
+        One UPDATE with F() expressions per ApplicationDate, call it in
+        the transaction that inserts the Screening rows.
+        """
+        increments = defaultdict(Counter)
+        for application_date_id, gender, rejection_reason in rejections:
+            increments[application_date_id].update(
+                cls.rejection_counters(gender, rejection_reason))
+
+        for application_date_id, counters in increments.items():
+            cls.objects.filter(application_date_id=application_date_id).update(
+                **{field: F(field) + count for field, count in counters.items()})
+
+    @classmethod
+    def count_rejections(cls, screening_model=None, **filters):
+        """
+        Count the rejections from Screening with one GROUP BY, returns
+        {application_date_id: {counter field: count}}
+        """
+        screening_model = screening_model or Screening
+        rows = screening_model.objects.filter(status='Unsuccessful').filter(
+            **{f'applicant__{lookup}': value for lookup, value in filters.items()}
+        ).values('applicant__application_date_id', 'applicant__gender',
+                 'rejection_reason').annotate(count=Count('id')).order_by()
+
+        counters = defaultdict(Counter)
+        for row in rows:
+            for field in cls.rejection_counters(row['applicant__gender'], row['rejection_reason']):
+                counters[row['applicant__application_date_id']][field] += row['count']
+        return counters
+
+    @classmethod
+    def rebuild_rejection_counters(cls, cohort_model=None, screening_model=None):
+        """
+        Repair every cohort counters from Screening. The models can be
+        historical ones, migration 0019 fills the counters with it.
+        """
+        cohort_model = cohort_model or cls
+        counters = cls.count_rejections(screening_model)
+        with transaction.atomic():
+            cohort_model.objects.update(**{field: 0 for field in cls.COUNTER_FIELDS})
+            for application_date_id, fields in counters.items():
+                cohort_model.objects.filter(
+                    application_date_id=application_date_id).update(**fields)
 
 
 class Pyp(Person):  # Only create instance of this model if status is 'successful'
@@ -276,7 +525,8 @@ class Pyp(Person):  # Only create instance of this model if status is 'successfu
     id_number = models.CharField(
         max_length=255, default=pyp_id_number_generator)
     placement_date = models.DateField(null=True, blank=True)
-    tor = models.FileField(upload_to=tor_upload_path, null=True, blank=True)
+    tor = models.FileField(upload_to=tor_upload_path, storage=get_document_storage,
+                           null=True, blank=True)
     employement_date = models.DateField(null=True, blank=True)
     position = models.CharField(max_length=100, default='PYP Fellow')
     # When the 'current' ApplicationStage.name == 'palcement'
@@ -345,34 +595,111 @@ class Document(QualificationChoice):
     country = models.CharField(max_length=100)
     county = models.CharField(max_length=100)  # providence/state
     # these are incomplete and validate its .pdf
-    degree = models.FileField(upload_to=degree_upload_path, validators=[
+    degree = models.FileField(upload_to=degree_upload_path, storage=get_document_storage, validators=[
                               FileExtensionValidator(allowed_extensions=['pdf'])])
     cgpa = models.DecimalField(max_digits=3, decimal_places=2)
     # incomplate and must be .pdf
-    application_letter = models.FileField(upload_to=application_upload_path, validators=[
+    application_letter = models.FileField(upload_to=application_upload_path, storage=get_document_storage, validators=[
                                           FileExtensionValidator(allowed_extensions=['pdf'])])
-    community_letter = models.FileField(upload_to=community_letter_upload_path, validators=[
+    community_letter = models.FileField(upload_to=community_letter_upload_path, storage=get_document_storage, validators=[
                                         FileExtensionValidator(allowed_extensions=['pdf'])])
-    reference_letter = models.FileField(upload_to=reference_letter_upload_path, validators=[
+    reference_letter = models.FileField(upload_to=reference_letter_upload_path, storage=get_document_storage, validators=[
                                         FileExtensionValidator(allowed_extensions=['pdf'])])
-    resume = models.FileField(upload_to=resume_upload_path, validators=[
+    resume = models.FileField(upload_to=resume_upload_path, storage=get_document_storage, validators=[
                               FileExtensionValidator(allowed_extensions=['pdf'])])
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         abstract = True
 
 
 class ApplicantDocument(Document):
+    FILE_FIELDS = ['degree', 'application_letter', 'community_letter',
+                   'reference_letter', 'resume', 'police_clearance']
+
     applicant = models.OneToOneField(
         Applicant, primary_key=True, on_delete=models.CASCADE, related_name='document')
-    police_clearance = models.FileField(upload_to=police_clearance_upload_path, validators=[
+    police_clearance = models.FileField(upload_to=police_clearance_upload_path, storage=get_document_storage, validators=[
                                         FileExtensionValidator(allowed_extensions=['pdf'])])
 
 
+class DocumentUpload(models.Model):
+    """
+    A file of an ApplicantDocument sent in chunks [see uploads.py]. The
+    bytes are appended to 'partial_path' until 'offset' reaches 'size',
+    then the upload is attached to the 'field' of the document.
+    """
+    FIELD_CHOICES = [(field, field.replace('_', ' ').capitalize())
+                     for field in ApplicantDocument.FILE_FIELDS]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL,
+                             on_delete=models.CASCADE, related_name='document_uploads')
+    field = models.CharField(max_length=20, choices=FIELD_CHOICES)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @staticmethod
+    def partial_directory():
+        return os.path.join(settings.MEDIA_ROOT, 'recruitment', 'uploads')
+
+    @property
+    def partial_path(self):
+        return os.path.join(self.partial_directory(), f'{self.pk}.part')
+
+    @property
+    def is_complete(self):
+        return self.offset == self.size
+
+
+class StoredBlob(models.Model):
+    """ How many file fields point at a ContentAddressedStorage blob """
+    name = models.CharField(max_length=255, primary_key=True)
+    size = models.PositiveBigIntegerField()
+    references = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class Job(models.Model):
+    """
+    Work done outside the request by 'manage.py run_jobs', see jobs.py.
+    Enqueued in the transaction of the change it's about so a rolled
+    back request leaves no job behind.
+    """
+    STATUS_CHOICES = (
+        ('Pending', 'Pending'),
+        ('Running', 'Running'),
+        ('Done', 'Done'),
+        ('Failed', 'Failed')
+    )
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=7, choices=STATUS_CHOICES, default='Pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    run_after = models.DateTimeField(default=timezone.now)
+    # Set when a worker claims it, see jobs.LEASE
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # The worker polls for the pending jobs that are due
+            models.Index(fields=['run_after'], name='job_pending_idx',
+                         condition=models.Q(status='Pending')),
+            # and for the running ones whose lease expired
+            models.Index(fields=['claimed_at'], name='job_running_idx',
+                         condition=models.Q(status='Running')),
+        ]
+
+
 class PypDocument(Document):
     pyp = models.ForeignKey(
         Pyp, on_delete=models.CASCADE, related_name='documents')
-    police_clearance = models.FileField(upload_to=police_clearance_upload_path, validators=[
+    police_clearance = models.FileField(upload_to=police_clearance_upload_path, storage=get_document_storage, validators=[
                                         FileExtensionValidator(allowed_extensions=['pdf'])])
 
 
@@ -388,23 +715,25 @@ class EmployeeDocument(QualificationChoice):
     institution = models.CharField(max_length=255)
     country = models.CharField(max_length=100)
     county = models.CharField(max_length=100)  # providence/state
-    degree = models.FileField(upload_to=emp_degree_upload_path, validators=[
+    degree = models.FileField(upload_to=emp_degree_upload_path, storage=get_document_storage, validators=[
                               FileExtensionValidator(allowed_extensions=['pdf'])])
     cgpa = models.DecimalField(max_digits=3, decimal_places=2)
-    application_letter = models.FileField(upload_to=emp_application_upload_path, validators=[
+    application_letter = models.FileField(upload_to=emp_application_upload_path, storage=get_document_storage, validators=[
                                           FileExtensionValidator(allowed_extensions=['pdf'])])
-    community_letter = models.FileField(upload_to=emp_community_letter_upload_path, validators=[
+    community_letter = models.FileField(upload_to=emp_community_letter_upload_path, storage=get_document_storage, validators=[
                                         FileExtensionValidator(allowed_extensions=['pdf'])])
-    reference_letter = models.FileField(upload_to=emp_reference_letter_upload_path, validators=[
+    reference_letter = models.FileField(upload_to=emp_reference_letter_upload_path, storage=get_document_storage, validators=[
                                         FileExtensionValidator(allowed_extensions=['pdf'])])
-    resume = models.FileField(upload_to=emp_resume_upload_path, validators=[
+    resume = models.FileField(upload_to=emp_resume_upload_path, storage=get_document_storage, validators=[
                               FileExtensionValidator(allowed_extensions=['pdf'])])
     employee = models.ForeignKey(
         Employee, on_delete=models.CASCADE, related_name='documents')
+    updated_at = models.DateTimeField(auto_now=True)
 
 
 class Contact(models.Model):
     phone = models.CharField(max_length=20, unique=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         abstract = True
@@ -457,6 +786,7 @@ class Address(CountyChoice):
     district = models.PositiveIntegerField(validators=[validate_district])
     community = models.CharField(max_length=100)
     house_address = models.CharField(max_length=100)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         abstract = True
@@ -0,0 +1,16 @@
+from rest_framework.pagination import CursorPagination
+
+
+class ApplicantCursorPagination(CursorPagination):
+    """
+    Keyset pagination, the cursor is the (apply_at, user_id) of the last
+    row sent so every page is an indexed range scan no matter how deep
+    the client scrolls. See Applicant.Meta.indexes for the backing index.
+
+    Clients can ask for a smaller/bigger page with '?page_size=' but
+    never more than 'max_page_size'.
+    """
+    ordering = ('apply_at', 'user_id')
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
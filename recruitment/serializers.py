@@ -1,9 +1,107 @@
+from collections import defaultdict
+from contextlib import ExitStack
 from datetime import date
+from django.core.files import File
 from django.db import transaction
+from django.utils import timezone
 from rest_framework import serializers
 
-from core.serializers import ReadUserSerializer, UserCreateSerializer
+from core.cache import bump_version_on_commit
+from core.serializers import FloatDecimalMixin, ReadUserSerializer, UserCreateSerializer
 from . import models
+from .thumbnails import thumbnail_urls
+from .uploads import attach_upload, discard_upload
+from .validators import DOCUMENT_SIZE_LIMITS, validate_document_files
+
+
+class DynamicFieldsModelSerializer(FloatDecimalMixin, serializers.ModelSerializer):
+    """
+    '?fields=a,b' keeps only the listed plain fields and '?expand=x,y'
+    keeps only the listed nested relations [Meta.expandable_fields].
+    Without both query params the full representation is returned so
+    the existing frontend pages keep working.
+
+    Meta.expandable_fields maps a nested field to how it's fetched
+    ['select' or 'prefetch'] and Meta.field_columns maps the
+    SerializerMethodFields to the column[s] they read, that's what
+    'shape_queryset' uses to narrow the viewset queryset.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None:
+            return
+
+        requested_fields = self.requested_fields(request.query_params)
+        if requested_fields is None:
+            return
+
+        for field_name in set(self.fields) - requested_fields:
+            self.fields.pop(field_name)
+
+    @classmethod
+    def requested_fields(cls, query_params):
+        """ Return None when the client didn't ask for a sparse fieldset """
+        fields_param = query_params.get('fields')
+        expand_param = query_params.get('expand')
+        if fields_param is None and expand_param is None:
+            return None
+
+        expandable_fields = getattr(cls.Meta, 'expandable_fields', {})
+        plain_fields = {
+            name for name in cls.Meta.fields if name not in expandable_fields}
+
+        if fields_param is not None:
+            plain_fields &= set(fields_param.split(','))
+        expanded_fields = set(expandable_fields) & set(
+            (expand_param or '').split(','))
+
+        return plain_fields | expanded_fields
+
+    @classmethod
+    def shape_queryset(cls, queryset, requested_fields, extra_columns=()):
+        """
+        Drop the select_related/prefetch_related of the relations that
+        aren't requested and defer the columns nobody reads.
+        """
+        expandable_fields = getattr(cls.Meta, 'expandable_fields', {})
+        field_columns = getattr(cls.Meta, 'field_columns', {})
+        model = cls.Meta.model
+        concrete_columns = {field.name for field in model._meta.concrete_fields}
+
+        select_related = [name for name in requested_fields
+                          if expandable_fields.get(name) == 'select']
+        prefetch_related = [name for name in requested_fields
+                            if expandable_fields.get(name) == 'prefetch']
+        columns = set(extra_columns)
+        for name in set(requested_fields) - set(expandable_fields):
+            column = field_columns.get(name, name)
+            columns.update([column] if isinstance(column, str) else column)
+        columns &= concrete_columns
+
+        return queryset.select_related(None).prefetch_related(None) \
+            .select_related(*select_related) \
+            .prefetch_related(*prefetch_related) \
+            .only(model._meta.pk.name, *columns, *select_related)
+
+
+class ThumbnailsField(serializers.ReadOnlyField):
+    """
+    {'small': url, 'medium': url, 'large': url} of a Person image, see
+    thumbnails.py. Reads 'image' and 'has_thumbnails' from the instance.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        super().__init__(**kwargs)
+
+    def to_representation(self, person):
+        urls = thumbnail_urls(person.image, person.has_thumbnails)
+        request = self.context.get('request')
+        if urls is None or request is None:
+            return urls
+        return {size: request.build_absolute_uri(url) for size, url in urls.items()}
 
 
 class ApplicationDateSerializer(serializers.ModelSerializer):
@@ -43,12 +141,112 @@ class ReadApplicationDateSerializer(serializers.ModelSerializer):
         return obj.close_date.strftime('%B %d, %Y')
 
 
-class ApplicantDocumentSerializer(serializers.ModelSerializer):
-    """ The user_id is the same as applicant due to their OneToOne relationship"""
+class RecruitmentQuerySerializer(serializers.Serializer):
+    """ Query params of the export and bundle actions, empty ones are dropped by the view """
+    application_date = serializers.IntegerField(required=False, min_value=1)
+    stage = serializers.IntegerField(required=False, min_value=1)
+
+
+class ApplicationStageSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.ApplicationStage
+        fields = ['id', 'name', 'order', 'is_current', 'application_date']
+
+
+class ApplicantDocumentSerializer(FloatDecimalMixin, serializers.ModelSerializer):
+    """
+    The user_id is the same as applicant due to their OneToOne relationship.
+    Each file can be sent as is or as '<field>_upload': the id of a
+    completed DocumentUpload [see uploads.py].
+    """
     class Meta:
         model = models.ApplicantDocument
         fields = ['applicant', 'qualification', 'graduation_year', 'major', 'manor', 'institution', 'country', 'county',
                   'cgpa', 'degree', 'application_letter', 'community_letter', 'reference_letter', 'resume', 'police_clearance']
+        extra_kwargs = {field: {'required': False}
+                        for field in models.ApplicantDocument.FILE_FIELDS}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for field in models.ApplicantDocument.FILE_FIELDS:
+            fields[f'{field}_upload'] = serializers.PrimaryKeyRelatedField(
+                queryset=models.DocumentUpload.objects.all(), write_only=True, required=False)
+        return fields
+
+    def validate(self, attrs):
+        request = self.context.get('request')
+        self.uploads = []
+        errors = {}
+        for field in models.ApplicantDocument.FILE_FIELDS:
+            upload = attrs.pop(f'{field}_upload', None)
+            if upload is None:
+                if field not in attrs and not self.partial:
+                    errors[field] = ['No file was submitted.']
+            elif request is not None and upload.user_id != request.user.id:
+                errors[f'{field}_upload'] = ['Upload not found.']
+            elif upload.field != field:
+                errors[f'{field}_upload'] = [f"The upload is for '{upload.field}'."]
+            elif not upload.is_complete:
+                errors[f'{field}_upload'] = [
+                    f'The upload is incomplete, {upload.offset} of {upload.size} bytes received.']
+            else:
+                self.uploads.append(upload)
+
+        if not errors:
+            errors = self.validate_files(attrs)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def validate_files(self, attrs):
+        """ The sent files and the partial files of the uploads, see validators.py """
+        files = {field: attrs[field] for field in models.ApplicantDocument.FILE_FIELDS
+                 if attrs.get(field)}
+        with ExitStack() as stack:
+            for upload in self.uploads:
+                files[upload.field] = stack.enter_context(
+                    File(open(upload.partial_path, 'rb'), upload.filename))
+            return validate_document_files(files)
+
+    def create(self, validated_data):
+        document = models.ApplicantDocument(**validated_data)
+        for upload in self.uploads:
+            attach_upload(document, upload)
+        document.save()
+        self.discard_uploads()
+        return document
+
+    def update(self, instance, validated_data):
+        for upload in self.uploads:
+            attach_upload(instance, upload)
+        instance = super().update(instance, validated_data)
+        self.discard_uploads()
+        return instance
+
+    def discard_uploads(self):
+        for upload in self.uploads:
+            discard_upload(upload)
+
+
+class DocumentUploadSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = models.DocumentUpload
+        fields = ['id', 'field', 'filename', 'size', 'offset', 'is_complete']
+        read_only_fields = ['offset']
+
+    is_complete = serializers.BooleanField(read_only=True)
+
+    def validate_filename(self, value):
+        if not value.lower().endswith('.pdf'):
+            raise serializers.ValidationError('Only .pdf files are allowed.')
+        return value
+
+    def validate(self, attrs):
+        limit = DOCUMENT_SIZE_LIMITS[attrs['field']]
+        if not 0 < attrs['size'] <= limit:
+            raise serializers.ValidationError(
+                {'size': [f'The file size must be between 1 and {limit} bytes.']})
+        return attrs
 
 
 class ApplicantAddressSerializer(serializers.ModelSerializer):
@@ -73,25 +271,31 @@ class ApplicantSerializer(serializers.ModelSerializer):
         fields = ['user', 'birth_date', 'gender', 'religion', 'county', 'image',
                   'id_number', 'status', 'rejection_reason']
 
+    @transaction.atomic()
     def create(self, validated_data):
-        instance = models.Applicant.objects.create(**validated_data)
         initial_stage = models.ApplicationStage.objects.get(is_current=True)
+        instance = models.Applicant.objects.create(
+            **validated_data, current_stage=initial_stage)
         initial_stage.applicants.add(instance.user.id)
         return instance
 
 
-class ReadApplicantSerializer(serializers.ModelSerializer):
+class ReadApplicantSerializer(DynamicFieldsModelSerializer):
     user = ReadUserSerializer()
     document = ApplicantDocumentSerializer()
     contacts = ApplicantContactSerializer(many=True)
     address = ApplicantAddressSerializer()
     birth_date = serializers.SerializerMethodField()
     age = serializers.SerializerMethodField()
+    thumbnails = ThumbnailsField()
 
     class Meta:
         model = models.Applicant
         fields = ['user', 'document', 'address', 'contacts', 'age', 'birth_date', 'gender', 'religion', 'county', 'image',
-                  'id_number', 'status', 'rejection_reason']
+                  'thumbnails', 'id_number', 'status', 'rejection_reason']
+        expandable_fields = {'user': 'select', 'document': 'select',
+                             'address': 'select', 'contacts': 'prefetch'}
+        field_columns = {'age': 'birth_date', 'thumbnails': ['image', 'has_thumbnails']}
 
     def get_birth_date(self, applicant):
         return applicant.birth_date.strftime('%B %d, %Y')
@@ -106,7 +310,7 @@ class ReadApplicantSerializer(serializers.ModelSerializer):
         return age
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(FloatDecimalMixin, serializers.ModelSerializer):
     """
     County represents the birth county of the employee
     """
@@ -130,12 +334,21 @@ class EmployeeSerializer(serializers.ModelSerializer):
                   'qualification', 'employment', 'position', 'supervisor', 'salary']
 
 
-class EmployeeDocumentSerializer(serializers.ModelSerializer):
+class EmployeeDocumentSerializer(FloatDecimalMixin, serializers.ModelSerializer):
     class Meta:
         model = models.EmployeeDocument
         fields = ['id', 'employee', 'qualification', 'graduation_year', 'major', 'manor', 'institution', 'country', 'county',
                   'cgpa', 'degree', 'application_letter', 'community_letter', 'reference_letter', 'resume']
 
+    def validate(self, attrs):
+        """ The PDFs are checked in parallel, see validators.py """
+        errors = validate_document_files(
+            {field: file for field, file in attrs.items()
+             if field in DOCUMENT_SIZE_LIMITS and file})
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
 
 class EmployeeAddressSerializer(serializers.ModelSerializer):
     class Meta:
@@ -150,18 +363,22 @@ class EmployeeContactSerializer(serializers.ModelSerializer):
         fields = ['id', 'employee', 'phone']
 
 
-class ReadEmployeeSerializer(serializers.ModelSerializer):
+class ReadEmployeeSerializer(DynamicFieldsModelSerializer):
     user = ReadUserSerializer()
     documents = EmployeeDocumentSerializer(many=True)
     contacts = EmployeeContactSerializer(many=True)
     address = EmployeeAddressSerializer()
     birth_date = serializers.SerializerMethodField()
     age = serializers.SerializerMethodField()
+    thumbnails = ThumbnailsField()
 
     class Meta:
         model = models.Employee
         fields = ['user', 'documents', 'address', 'contacts', 'age', 'birth_date', 'gender', 'religion', 'image',
-                  'county', 'qualification', 'employment', 'position', 'supervisor', 'salary']
+                  'thumbnails', 'county', 'qualification', 'employment', 'position', 'supervisor', 'salary']
+        expandable_fields = {'user': 'select', 'address': 'select',
+                             'documents': 'prefetch', 'contacts': 'prefetch'}
+        field_columns = {'age': 'birth_date', 'thumbnails': ['image', 'has_thumbnails']}
 
     def get_birth_date(self, emp):
         return emp.birth_date.strftime('%B %d, %Y')
@@ -183,10 +400,11 @@ class EmployeeSupervisorSerializer(serializers.ModelSerializer):
     """
     id = serializers.SerializerMethodField()
     full_name = serializers.SerializerMethodField()
+    thumbnails = ThumbnailsField()
 
     class Meta:
         model = models.Employee
-        fields = ['id', 'full_name']
+        fields = ['id', 'full_name', 'thumbnails']
 
     def get_id(self, emp):
         return emp.user.id
@@ -199,25 +417,128 @@ class ReadQualifyApplicantSerializr(serializers.ModelSerializer):
     """Don't show any attr that can identify an applicant for transparency purpose"""
     user = ReadUserSerializer()
     document = ApplicantDocumentSerializer()
-    stage_name = serializers.SerializerMethodField()
-    stage_id = serializers.SerializerMethodField()
+    stage_name = serializers.CharField(
+        source='current_stage.name', read_only=True)
+    # Use when posting applicant screening data
+    stage_id = serializers.IntegerField(
+        source='current_stage_id', read_only=True)
 
     class Meta:
         model = models.Applicant
         fields = ['user', 'document', 'id_number', 'status', 'stage_name', 'stage_id']
 
-    def get_stage_name(self, applicant):
-        stage_name = applicant.stages.filter(is_current=True)[0].name
-        return stage_name if stage_name else ""
-    
-    def get_stage_id(self, applicant):
-        """ Use when posting applicant screening data"""
-        stage_id = applicant.stages.filter(is_current=True)[0].id
-        return stage_id if stage_id else 0
-
 
 class ApplicantScreeningSerializer(serializers.ModelSerializer):
     class Meta:
         model = models.Screening
         fields = ['id', 'status', 'rejection_reason',
                   'applicant', 'stage', 'process_by']
+
+
+class ScreeningRowSerializer(serializers.Serializer):
+    """
+    One row of a screening batch. The relations are plain integers
+    because BulkScreeningSerializer checks them for the whole batch at
+    once, a PrimaryKeyRelatedField would run a query per row.
+    """
+    applicant = serializers.IntegerField()
+    stage = serializers.IntegerField()
+    process_by = serializers.IntegerField(required=False, allow_null=True)
+    status = serializers.ChoiceField(choices=models.Screening.STATUS_CHOICES)
+    rejection_reason = serializers.ChoiceField(
+        choices=models.Screening.REJECTION_REASON_CHOICES, required=False,
+        allow_null=True, allow_blank=True)
+    other_rejection_reason = serializers.CharField(
+        required=False, allow_null=True, allow_blank=True)
+
+
+class BulkScreeningSerializer(serializers.Serializer):
+    """
+    Screen a whole batch with a constant number of queries: the payload
+    is validated up front, Screening rows are bulk created, the
+    applicants status is updated with one UPDATE per status and the
+    Cohort rejection counters with one UPDATE per recruitment.
+    Errors are returned per row in the same order as the payload.
+    """
+    applicants = ScreeningRowSerializer(many=True, allow_empty=False)
+
+    def validate_applicants(self, rows):
+        applicant_ids = {row['applicant'] for row in rows}
+        stage_ids = {row['stage'] for row in rows}
+        employee_ids = {row['process_by'] for row in rows
+                        if row.get('process_by') is not None}
+
+        # gender and application_date are for the Cohort rejection counters
+        self.applicants_by_pk = {applicant['pk']: applicant for applicant in models.Applicant.objects.filter(
+            pk__in=applicant_ids).values('pk', 'gender', 'application_date_id')}
+        existing_applicants = set(self.applicants_by_pk)
+        existing_stages = set(models.ApplicationStage.objects.filter(
+            pk__in=stage_ids).values_list('pk', flat=True))
+        existing_employees = set(models.Employee.objects.filter(
+            pk__in=employee_ids).values_list('pk', flat=True))
+
+        errors = []
+        seen_applicants = set()
+        for row in rows:
+            row_errors = {}
+            if row['applicant'] not in existing_applicants:
+                row_errors['applicant'] = [
+                    f'Invalid pk "{row["applicant"]}" - object does not exist.']
+            elif row['applicant'] in seen_applicants:
+                row_errors['applicant'] = [
+                    'Applicant is screened more than once in this batch.']
+            if row['stage'] not in existing_stages:
+                row_errors['stage'] = [
+                    f'Invalid pk "{row["stage"]}" - object does not exist.']
+            process_by = row.get('process_by')
+            if process_by is not None and process_by not in existing_employees:
+                row_errors['process_by'] = [
+                    f'Invalid pk "{process_by}" - object does not exist.']
+
+            seen_applicants.add(row['applicant'])
+            errors.append(row_errors)
+
+        if any(errors):
+            raise serializers.ValidationError(errors)
+        return rows
+
+    def create(self, validated_data):
+        rows = validated_data['applicants']
+        screenings = models.Screening.objects.bulk_create([
+            models.Screening(
+                applicant_id=row['applicant'],
+                stage_id=row['stage'],
+                process_by_id=row.get('process_by'),
+                status=row['status'],
+                rejection_reason=row.get('rejection_reason') or None,
+                other_rejection_reason=row.get('other_rejection_reason'))
+            for row in rows
+        ])
+
+        applicant_ids_by_status = defaultdict(list)
+        for row in rows:
+            applicant_ids_by_status[row['status']].append(row['applicant'])
+        for applicant_status, applicant_ids in applicant_ids_by_status.items():
+            # update() skips auto_now, the profile ETag needs updated_at
+            models.Applicant.objects.filter(pk__in=applicant_ids).update(
+                status=applicant_status, updated_at=timezone.now())
+
+        # bulk_create and update() skip Screening.save and the signals
+        bump_version_on_commit(models.ApplicationDate.DASHBOARD_CACHE_NAMESPACE)
+        models.Cohort.record_rejections([
+            (self.applicants_by_pk[row['applicant']]['application_date_id'],
+             self.applicants_by_pk[row['applicant']]['gender'],
+             row.get('rejection_reason'))
+            for row in rows if row['status'] == 'Unsuccessful'])
+
+        return screenings
+
+    def to_representation(self, screenings):
+        """ Per row result report, same order as the payload """
+        return {
+            'screened': len(screenings),
+            'results': [{'applicant': screening.applicant_id,
+                         'screening': screening.id,
+                         'status': screening.status}
+                        for screening in screenings]
+        }
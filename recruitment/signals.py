@@ -0,0 +1,102 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from core.cache import bump_version_on_commit
+from core.models import User
+from . import models, search
+from .storage import content_addressed_fields
+from .jobs import enqueue
+
+@receiver([post_save, post_delete], sender=models.Applicant)
+@receiver([post_save, post_delete], sender=models.ApplicantDocument)
+@receiver([post_save, post_delete], sender=models.Screening)
+def invalidate_dashboard(sender, **kwargs):
+    """
+    Queryset update()/bulk_create() don't send signals, the version is
+    also bumped where they're used.
+    """
+    bump_version_on_commit(models.ApplicationDate.DASHBOARD_CACHE_NAMESPACE)
+
+
+@receiver([post_save, post_delete], sender=models.ApplicationDate)
+@receiver([post_save, post_delete], sender=models.ApplicationStage)
+def invalidate_cached_responses(sender, **kwargs):
+    """
+    ApplicationDate.save sets is_current=False on the other dates with
+    update(), the post_save of the saved date covers them.
+    """
+    bump_version_on_commit(sender.CACHE_NAMESPACE)
+
+
+
+@receiver(pre_save, sender=models.ApplicantDocument)
+@receiver(pre_save, sender=models.PypDocument)
+@receiver(pre_save, sender=models.EmployeeDocument)
+@receiver(pre_save, sender=models.Pyp)
+def find_replaced_files(sender, instance, raw=False, **kwargs):
+    """ The blobs this save replaces, released in 'release_replaced_files' """
+    instance._replaced_files = []
+    if raw or instance._state.adding:
+        return
+    fields = content_addressed_fields(sender)
+    stored = sender.objects.filter(pk=instance.pk).values(
+        *[field.attname for field in fields]).first() or {}
+    for field in fields:
+        name = stored.get(field.attname)
+        if name and name != getattr(instance, field.attname).name:
+            instance._replaced_files.append((field, name))
+
+
+@receiver(post_save, sender=models.ApplicantDocument)
+@receiver(post_save, sender=models.PypDocument)
+@receiver(post_save, sender=models.EmployeeDocument)
+@receiver(post_save, sender=models.Pyp)
+def release_replaced_files(sender, instance, **kwargs):
+    for field, name in instance.__dict__.pop('_replaced_files', []):
+        field.storage.delete(name)
+
+
+@receiver(post_delete, sender=models.ApplicantDocument)
+@receiver(post_delete, sender=models.PypDocument)
+@receiver(post_delete, sender=models.EmployeeDocument)
+@receiver(post_delete, sender=models.Pyp)
+def release_deleted_files(sender, instance, **kwargs):
+    for field in content_addressed_fields(sender):
+        field.storage.delete(getattr(instance, field.attname).name)
+
+
+@receiver(pre_save, sender=models.Applicant)
+@receiver(pre_save, sender=models.Employee)
+@receiver(pre_save, sender=models.Pyp)
+def find_uploaded_image(sender, instance, raw=False, **kwargs):
+    """ An uncommitted image is a new upload, FileField.pre_save stores it """
+    instance._image_uploaded = (
+        not raw and bool(instance.image) and not instance.image._committed)
+    if instance._image_uploaded:
+        instance.has_thumbnails = False
+
+
+@receiver(post_save, sender=models.Applicant)
+@receiver(post_save, sender=models.Employee)
+@receiver(post_save, sender=models.Pyp)
+def enqueue_thumbnails(sender, instance, **kwargs):
+    if instance.__dict__.pop('_image_uploaded', False):
+        enqueue('create_thumbnails', model=sender._meta.label_lower, pk=instance.pk)
+
+
+@receiver(post_save, sender=models.Applicant)
+@receiver([post_save, post_delete], sender=models.ApplicantDocument)
+@receiver([post_save, post_delete], sender=models.ApplicantAddress)
+@receiver(post_save, sender=User)
+def update_search_index(sender, instance, **kwargs):
+    """ The applicant pk is the user pk, a User that isn't an applicant indexes nothing """
+    if kwargs.get('raw') or not search.search_available():
+        return
+    applicant_id = instance.pk if sender in (models.Applicant, User) else instance.applicant_id
+    search.index_applicants(models.Applicant.objects.filter(pk=applicant_id))
+
+
+@receiver(post_delete, sender=models.Applicant)
+def remove_from_search_index(sender, instance, **kwargs):
+    if search.search_available():
+        search.remove_applicants([instance.pk])
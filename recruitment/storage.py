@@ -0,0 +1,115 @@
+import hashlib
+import os
+import tempfile
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F, FileField
+
+BLOB_PREFIX = 'recruitment/blobs'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Files are stored under their SHA-256, 'recruitment/blobs/ab/cd/abcd...pdf',
+    the name from upload_to only gives the extension. A file that's already
+    stored isn't written again and two uploads can't overwrite each other.
+    The URL of a blob never changes.
+
+    StoredBlob counts the FileFields pointing at a blob: 'save' adds one,
+    'delete' removes one and the file goes when nothing points at it.
+    Both write the row before checking anything so they wait for each
+    other, a save can't reuse a file a delete is about to remove.
+    Names saved before this storage [e.g. 'recruitment/degree/1.pdf'] have
+    no StoredBlob and are never deleted.
+    """
+
+    def blob_name(self, content, name):
+        digest = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+
+        hexdigest = digest.hexdigest()
+        _, extension = os.path.splitext(name)
+        return f'{BLOB_PREFIX}/{hexdigest[:2]}/{hexdigest[2:4]}/{hexdigest}{extension.lower()}'
+
+    def get_available_name(self, name, max_length=None):
+        """ The same content has the same name, there is nothing to rename """
+        return name
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+
+        name = self.blob_name(content, name)
+        StoredBlob = apps.get_model('recruitment', 'StoredBlob')
+        with transaction.atomic():
+            # The reference is added first, it locks the row so a
+            # concurrent '_remove_unreferenced' can't remove the file
+            # between the exists() check and the commit. Loops when that
+            # removed the row in between.
+            while not StoredBlob.objects.filter(name=name).update(references=F('references') + 1):
+                StoredBlob.objects.get_or_create(name=name, defaults={'size': content.size})
+            if not self.exists(name):
+                self._write_blob(name, content)
+        return name
+
+    def _write_blob(self, name, content):
+        """ Written to a temp file then renamed, readers never see half a file """
+        path = self.path(name)
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as temp_file:
+                for chunk in content.chunks():
+                    temp_file.write(chunk)
+            # mkstemp creates it readable by the owner only
+            os.chmod(temp_path, self.file_permissions_mode or 0o644)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def delete(self, name):
+        if not name:
+            return
+        StoredBlob = apps.get_model('recruitment', 'StoredBlob')
+        with transaction.atomic():
+            blob = StoredBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None or blob.references == 0:
+                return
+            StoredBlob.objects.filter(name=name).update(
+                references=F('references') - 1)
+            if blob.references == 1:
+                # The row stays at 0 until the file is removed with it
+                transaction.on_commit(lambda: self._remove_unreferenced(name))
+
+    def _remove_unreferenced(self, name):
+        """
+        The row is deleted only if still unreferenced and the file is
+        removed before the COMMIT, a concurrent 'save' waits on the row
+        and then writes the file again.
+        """
+        StoredBlob = apps.get_model('recruitment', 'StoredBlob')
+        with transaction.atomic():
+            deleted, _ = StoredBlob.objects.filter(name=name, references=0).delete()
+            if deleted:
+                super().delete(name)
+
+
+document_storage = ContentAddressedStorage()
+
+
+def get_document_storage():
+    """ Callable so the migrations don't depend on the storage settings """
+    return document_storage
+
+
+def content_addressed_fields(model):
+    return [field for field in model._meta.concrete_fields
+            if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage)]
\ No newline at end of file
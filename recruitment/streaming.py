@@ -0,0 +1,54 @@
+import zipfile
+
+
+class Echo:
+    """ File-like object for csv.writer, 'write' hands back the row instead of storing it """
+
+    def write(self, value):
+        return value
+
+
+class ZipBuffer:
+    """
+    Write only, unseekable file for zipfile.ZipFile. zipfile then writes
+    data descriptors instead of seeking back, and whatever it has written
+    so far is handed out by 'pop', so the archive is never held in memory.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def zip_stream(entries, compression=zipfile.ZIP_DEFLATED):
+    """
+    entries: iterable of (archive name, iterable of bytes chunks).
+    Yields the archive bytes as the entries are read.
+    """
+    buffer = ZipBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=compression) as archive:
+        for name, chunks in entries:
+            with archive.open(name, 'w', force_zip64=True) as entry:
+                for chunk in chunks:
+                    entry.write(chunk)
+                    data = buffer.pop()
+                    if data:
+                        yield data
+            yield buffer.pop()
+    yield buffer.pop()
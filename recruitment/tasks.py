@@ -0,0 +1,23 @@
+from django.apps import apps
+from django.core.files.storage import default_storage
+
+from .jobs import task
+from .thumbnails import delete_thumbnails, make_thumbnails
+
+
+@task
+def create_thumbnails(model, pk):
+    """ 'model' is the label, e.g. 'recruitment.applicant' """
+    model = apps.get_model(model)
+    person = model.objects.filter(pk=pk).only('image').first()
+    if person is not None and person.image:
+        make_thumbnails(person.image)
+        # Unless the image was replaced meanwhile, its own job sets it then
+        model.objects.filter(pk=pk, image=person.image.name).update(has_thumbnails=True)
+
+
+@task
+def delete_image(name):
+    """ A replaced Person.image and its thumbnails """
+    default_storage.delete(name)
+    delete_thumbnails(name, default_storage)
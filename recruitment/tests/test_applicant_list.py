@@ -0,0 +1,116 @@
+import io
+import zipfile
+import pytest
+from rest_framework import status
+from model_bakery import baker
+
+from recruitment.models import Applicant, ApplicationDate
+from recruitment.pagination import ApplicantCursorPagination
+
+
+APPLICANT_ENDPOINT = '/recruitment/applicants/'
+
+
+@pytest.mark.django_db
+class TestApplicantList:
+    """
+    The applicants list is cursor paginated on (apply_at, user_id).
+    If you don't want field validation use Model Baker.
+    """
+
+    def make_applicants(self, quantity):
+        baker.make(ApplicationDate)
+        return baker.make(Applicant, _quantity=quantity)
+
+    def test_if_list_is_paginated_return_200(self, superuser_client):
+        self.make_applicants(3)
+        response = superuser_client.get(APPLICANT_ENDPOINT, {'page_size': 2})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 2
+        assert response.data['next'] is not None
+
+    def test_if_next_cursor_returns_remaining_applicants(self, superuser_client):
+        applicants = self.make_applicants(3)
+        first_page = superuser_client.get(
+            APPLICANT_ENDPOINT, {'page_size': 2})
+        second_page = superuser_client.get(first_page.data['next'])
+
+        ids = [app['user']['id'] for app in first_page.data['results']] + \
+            [app['user']['id'] for app in second_page.data['results']]
+
+        assert second_page.data['next'] is None
+        assert ids == [app.user.id for app in applicants]
+
+    def test_if_oversized_page_size_is_capped_return_200(self, superuser_client, monkeypatch):
+        """ page_size above max_page_size falls back to max_page_size """
+        monkeypatch.setattr(ApplicantCursorPagination, 'max_page_size', 2)
+        self.make_applicants(3)
+        response = superuser_client.get(
+            APPLICANT_ENDPOINT, {'page_size': 10_000})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['results']) == 2
+        assert response.data['next'] is not None
+
+    def test_if_fields_param_returns_sparse_fieldset(self, superuser_client):
+        self.make_applicants(2)
+        response = superuser_client.get(
+            APPLICANT_ENDPOINT, {'fields': 'id_number,status,age'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data['results'][0]) == {
+            'id_number', 'status', 'age'}
+
+    def test_if_expand_param_keeps_only_expanded_relations(self, superuser_client):
+        self.make_applicants(2)
+        response = superuser_client.get(
+            APPLICANT_ENDPOINT, {'fields': 'status', 'expand': 'user'})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert set(response.data['results'][0]) == {'status', 'user'}
+        assert response.data['results'][0]['user']['id'] > 0
+
+    def test_if_sparse_fieldset_skips_joins_and_prefetches(
+            self, superuser_client, django_assert_num_queries):
+        self.make_applicants(3)
+        # One query for the page, no prefetch of contacts
+        with django_assert_num_queries(1):
+            superuser_client.get(APPLICANT_ENDPOINT, {'fields': 'status'})
+
+    def test_if_export_streams_csv_return_200(self, superuser_client):
+        applicants = self.make_applicants(2)
+        response = superuser_client.get(f'{APPLICANT_ENDPOINT}export/')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/csv'
+        assert lines[0].startswith('ID number,First name')
+        assert len(lines) == 3
+        assert lines[1].startswith(applicants[0].id_number)
+
+    def test_if_export_application_date_is_invalid_return_400(self, superuser_client):
+        response = superuser_client.get(
+            f'{APPLICANT_ENDPOINT}export/', {'application_date': 'abc'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'application_date' in response.data
+
+    def test_if_export_filters_application_date_return_200(self, superuser_client):
+        applicant = self.make_applicants(1)[0]
+        response = superuser_client.get(
+            f'{APPLICANT_ENDPOINT}export/', {'application_date': applicant.application_date_id + 1})
+        lines = b''.join(response.streaming_content).decode().splitlines()
+
+        assert len(lines) == 1
+
+    def test_if_export_streams_xlsx_return_200(self, superuser_client):
+        self.make_applicants(2)
+        response = superuser_client.get(
+            f'{APPLICANT_ENDPOINT}export/', {'file_type': 'xlsx'})
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        sheet = archive.read('xl/worksheets/sheet1.xml').decode()
+
+        assert response.status_code == status.HTTP_200_OK
+        assert archive.testzip() is None
+        assert sheet.count('<row>') == 3
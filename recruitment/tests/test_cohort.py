@@ -0,0 +1,94 @@
+import importlib
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from model_bakery import baker
+
+from recruitment.models import (
+    Applicant, ApplicationDate, ApplicationStage, Cohort, Screening)
+from recruitment.serializers import BulkScreeningSerializer
+
+
+@pytest.mark.django_db
+class TestCohortCounters:
+    """ The rejection counters follow the 'Unsuccessful' Screenings """
+
+    def make_recruitment(self):
+        application_date = baker.make(ApplicationDate)
+        stage = baker.make(ApplicationStage, application_date=application_date,
+                           order=1, is_current=True)
+        cohort = baker.make(Cohort, application_date=application_date)
+        return application_date, stage, cohort
+
+    def test_if_screening_save_updates_counters(self):
+        application_date, stage, cohort = self.make_recruitment()
+        applicant = baker.make(Applicant, application_date=application_date,
+                               gender='Female')
+        Screening.objects.create(applicant=applicant, stage=stage, status='Unsuccessful',
+                                 rejection_reason='Police clearance')
+        Screening.objects.create(applicant=applicant, stage=stage, status='Pending')
+        cohort.refresh_from_db()
+
+        assert cohort.rejected_female_count == 1
+        assert cohort.rejected_police_clearance_count == 1
+        assert cohort.rejected_male_count == 0
+
+    def test_if_bulk_screening_updates_counters(self):
+        application_date, stage, cohort = self.make_recruitment()
+        applicants = baker.make(Applicant, application_date=application_date,
+                                gender='Male', _quantity=3)
+        serializer = BulkScreeningSerializer(data={'applicants': [
+            {'applicant': applicant.pk, 'stage': stage.pk,
+             'status': 'Unsuccessful', 'rejection_reason': 'Absent'}
+            for applicant in applicants]})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        cohort.refresh_from_db()
+
+        assert cohort.rejected_male_count == 3
+        assert cohort.rejection_absent_count == 3
+
+    def test_if_rebuild_command_repairs_counters(self):
+        application_date, stage, cohort = self.make_recruitment()
+        applicant = baker.make(Applicant, application_date=application_date,
+                               gender='Male')
+        Screening.objects.create(applicant=applicant, stage=stage, status='Unsuccessful',
+                                 rejection_reason='Document')
+        Cohort.objects.update(rejected_male_count=10, rejection_other_count=0)
+        call_command('rebuild_cohort_counters')
+        cohort.refresh_from_db()
+
+        assert cohort.rejected_male_count == 1
+        assert cohort.rejection_other_count == 1
+
+    def test_if_migration_fills_existing_counters(self, settings):
+        application_date, stage, cohort = self.make_recruitment()
+        applicant = baker.make(Applicant, application_date=application_date,
+                               gender='Female')
+        Screening.objects.create(applicant=applicant, stage=stage, status='Unsuccessful',
+                                 rejection_reason='Diploma')
+        Cohort.objects.update(rejected_female_count=0, rejected_diploma_count=0)
+        migration = importlib.import_module('recruitment.migrations.0019_cohort_counter_defaults')
+        # The models as they were at 0019, the tests run without migrations
+        settings.MIGRATION_MODULES = {}
+        historical_apps = MigrationLoader(connection).project_state(
+            ('recruitment', '0019_cohort_counter_defaults')).apps
+
+        migration.rebuild_rejection_counters(historical_apps, None)
+        cohort.refresh_from_db()
+
+        assert cohort.rejected_female_count == 1
+        assert cohort.rejected_diploma_count == 1
+
+    def test_if_new_cohort_starts_from_existing_rejections(self):
+        application_date, stage, _ = self.make_recruitment()
+        applicant = baker.make(Applicant, application_date=application_date,
+                               gender='Female')
+        Screening.objects.create(applicant=applicant, stage=stage, status='Unsuccessful',
+                                 rejection_reason='Interview')
+        cohort = baker.make(Cohort, application_date=application_date)
+
+        assert cohort.rejected_female_count == 1
+        assert cohort.rejected_interview_count == 1
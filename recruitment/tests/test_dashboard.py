@@ -0,0 +1,70 @@
+import pytest
+from rest_framework import status
+from model_bakery import baker
+
+from core.cache import get_version
+from recruitment.models import (
+    Applicant, ApplicantDocument, ApplicationDate, ApplicationStage)
+
+
+APPLICATION_DATE_ENDPOINT = '/recruitment/application-dates/'
+
+
+@pytest.mark.django_db
+class TestDashboard:
+    """ If you don't want field validation use Model Baker """
+
+    def make_recruitment(self):
+        application_date = baker.make(ApplicationDate)
+        stage = baker.make(ApplicationStage, application_date=application_date,
+                           name='Publicity', order=1, is_current=True)
+        applicants = baker.make(Applicant, application_date=application_date,
+                                county='Bong', gender='Male', _quantity=2)
+        stage.applicants.add(*applicants)
+        baker.make(ApplicantDocument, applicant=applicants[0],
+                   qualification='Master')
+        return application_date
+
+    def get_dashboard(self, client, application_date):
+        return client.get(
+            f'{APPLICATION_DATE_ENDPOINT}{application_date.pk}/dashboard/')
+
+    def test_if_dashboard_returns_counts_return_200(self, superuser_client):
+        application_date = self.make_recruitment()
+        response = self.get_dashboard(superuser_client, application_date)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['total'] == 2
+        assert response.data['county'] == [{'value': 'Bong', 'count': 2}]
+        assert response.data['stage'] == [{'value': 'Publicity', 'count': 2}]
+        assert {'value': 'Master', 'count': 1} in response.data['qualification']
+
+    def test_if_dashboard_is_cached(self, superuser_client, django_assert_max_num_queries):
+        application_date = self.make_recruitment()
+        self.get_dashboard(superuser_client, application_date)
+
+        # Only the ApplicationDate lookup
+        with django_assert_max_num_queries(1):
+            self.get_dashboard(superuser_client, application_date)
+
+    def test_if_saving_applicant_invalidates_dashboard(self, superuser_client, django_capture_on_commit_callbacks):
+        application_date = self.make_recruitment()
+        self.get_dashboard(superuser_client, application_date)
+        with django_capture_on_commit_callbacks(execute=True):
+            baker.make(Applicant, application_date=application_date)
+        response = self.get_dashboard(superuser_client, application_date)
+
+        assert response.data['total'] == 3
+
+    def test_if_dashboard_version_is_bumped_after_commit(self, django_capture_on_commit_callbacks):
+        application_date = self.make_recruitment()
+        version = get_version(ApplicationDate.DASHBOARD_CACHE_NAMESPACE)
+        with django_capture_on_commit_callbacks() as callbacks:
+            baker.make(Applicant, application_date=application_date)
+            # A request reading before the COMMIT still sees the old rows
+            assert get_version(ApplicationDate.DASHBOARD_CACHE_NAMESPACE) == version
+
+        for callback in callbacks:
+            callback()
+
+        assert get_version(ApplicationDate.DASHBOARD_CACHE_NAMESPACE) != version
@@ -0,0 +1,185 @@
+import io
+import os
+import uuid
+from datetime import timedelta
+
+import pytest
+from model_bakery import baker
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework import status
+
+from recruitment.models import (
+    Applicant, ApplicantDocument, ApplicationDate, DocumentUpload)
+
+UPLOADS_ENDPOINT = '/recruitment/document-uploads/'
+
+
+def create_pdf():
+    pdf_buffer = io.BytesIO()
+    c = canvas.Canvas(pdf_buffer, pagesize=letter)
+    c.drawString(100, 750, "Hello, this is a PDF file generated dynamically!")
+    c.save()
+    return pdf_buffer.getvalue()
+
+
+PDF = create_pdf()
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def start_upload(client, field='resume', size=len(PDF)):
+    return client.post(UPLOADS_ENDPOINT, {'field': field, 'filename': f'{field}.pdf',
+                                          'size': size}, format='json')
+
+
+def send_chunk(client, upload_id, offset, data):
+    return client.put(f'{UPLOADS_ENDPOINT}{upload_id}/chunk/', data,
+                      content_type='application/octet-stream', HTTP_UPLOAD_OFFSET=str(offset))
+
+
+def upload_file(client, field):
+    upload_id = start_upload(client, field).data['id']
+    send_chunk(client, upload_id, 0, PDF)
+    return upload_id
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('media_root')
+class TestDocumentUpload:
+    """ If you don't want field validation use Model Baker """
+
+    def test_if_chunks_are_appended_return_200(self, superuser_client):
+        upload_id = start_upload(superuser_client).data['id']
+
+        first = send_chunk(superuser_client, upload_id, 0, PDF[:40])
+        second = send_chunk(superuser_client, upload_id, 40, PDF[40:])
+
+        assert first.status_code == status.HTTP_200_OK
+        assert first.data['offset'] == 40
+        assert second.data['offset'] == len(PDF)
+        assert second.data['is_complete']
+        upload = DocumentUpload.objects.get(pk=upload_id)
+        with open(upload.partial_path, 'rb') as partial:
+            assert partial.read() == PDF
+
+    def test_if_offset_is_wrong_return_409(self, superuser_client):
+        upload_id = start_upload(superuser_client).data['id']
+        send_chunk(superuser_client, upload_id, 0, PDF[:40])
+
+        response = send_chunk(superuser_client, upload_id, 10, PDF[10:])
+
+        assert response.status_code == status.HTTP_409_CONFLICT
+        assert response.data['offset'] == 40
+
+    def test_if_resume_overwrites_an_incomplete_chunk_return_200(self, superuser_client):
+        """ Bytes past the offset are left behind by a dropped chunk """
+        upload_id = start_upload(superuser_client).data['id']
+        upload = DocumentUpload.objects.get(pk=upload_id)
+        os.makedirs(os.path.dirname(upload.partial_path))
+        with open(upload.partial_path, 'wb') as partial:
+            partial.write(b'garbage')
+
+        send_chunk(superuser_client, upload_id, 0, PDF)
+
+        with open(upload.partial_path, 'rb') as partial:
+            assert partial.read() == PDF
+
+    def test_if_chunk_goes_past_the_size_return_400(self, superuser_client):
+        upload_id = start_upload(superuser_client, size=10).data['id']
+
+        response = send_chunk(superuser_client, upload_id, 0, PDF)
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_if_user_cannot_see_other_user_upload_return_404(self, superuser_client):
+        upload = baker.make(DocumentUpload, size=10)
+
+        response = superuser_client.get(f'{UPLOADS_ENDPOINT}{upload.pk}/')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_if_document_is_created_from_uploads_return_201(self, superuser_client):
+        applicant = baker.make(Applicant, application_date=baker.make(ApplicationDate))
+        payload = {'applicant': applicant.pk, 'qualification': 'Bachelor',
+                   'graduation_year': 2020, 'major': 'math', 'manor': 'lab',
+                   'institution': 'EDU', 'country': 'Lib', 'county': 'Bong', 'cgpa': 3.8}
+        for field in ApplicantDocument.FILE_FIELDS:
+            payload[f'{field}_upload'] = upload_file(superuser_client, field)
+        paths = [upload.partial_path for upload in DocumentUpload.objects.all()]
+
+        response = superuser_client.post(
+            '/recruitment/applicant-documents/', payload, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        document = ApplicantDocument.objects.get(pk=applicant.pk)
+        with document.resume.open('rb') as resume:
+            assert resume.read() == PDF
+        assert not DocumentUpload.objects.exists()
+        assert not any(os.path.exists(path) for path in paths)
+
+    def test_if_uploaded_file_is_not_a_pdf_return_400(self, superuser_client):
+        document = baker.make(ApplicantDocument, applicant__application_date=baker.make(ApplicationDate))
+        upload_id = start_upload(superuser_client, size=100).data['id']
+        send_chunk(superuser_client, upload_id, 0, b'\xff\xd8\xff\xe0' + b'x' * 96)
+
+        response = superuser_client.patch(
+            f'/recruitment/applicant-documents/{document.pk}/',
+            {'resume_upload': upload_id}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['resume'] == ['The file is not a PDF.']
+
+    def test_if_document_upload_is_incomplete_return_400(self, superuser_client):
+        document = baker.make(ApplicantDocument, applicant__application_date=baker.make(ApplicationDate))
+        upload_id = start_upload(superuser_client).data['id']
+
+        response = superuser_client.patch(
+            f'/recruitment/applicant-documents/{document.pk}/',
+            {'resume_upload': upload_id}, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'incomplete' in response.data['resume_upload'][0]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('media_root')
+class TestExpireUploads:
+    def make_partial(self, name, age):
+        directory = DocumentUpload.partial_directory()
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, name)
+        with open(path, 'wb') as partial:
+            partial.write(b'%PDF-')
+        old = (timezone.now() - age).timestamp()
+        os.utime(path, (old, old))
+        return path
+
+    def test_if_abandoned_upload_is_removed(self):
+        abandoned = baker.make(DocumentUpload, size=10)
+        DocumentUpload.objects.filter(pk=abandoned.pk).update(
+            created_at=timezone.now() - timedelta(days=2))
+        current = baker.make(DocumentUpload, size=10)
+        abandoned_path = self.make_partial(f'{abandoned.pk}.part', timedelta(days=2))
+        current_path = self.make_partial(f'{current.pk}.part', timedelta(0))
+
+        call_command('expire_uploads')
+
+        assert list(DocumentUpload.objects.all()) == [current]
+        assert not os.path.exists(abandoned_path)
+        assert os.path.exists(current_path)
+
+    def test_if_old_partial_without_upload_is_removed(self):
+        orphan_path = self.make_partial(f'{uuid.uuid4()}.part', timedelta(days=2))
+        recent_path = self.make_partial(f'{uuid.uuid4()}.part', timedelta(hours=1))
+
+        call_command('expire_uploads')
+
+        assert not os.path.exists(orphan_path)
+        assert os.path.exists(recent_path)
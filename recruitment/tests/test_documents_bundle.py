@@ -0,0 +1,89 @@
+import io
+import os
+import zipfile
+
+import pytest
+from django.core.files.base import ContentFile
+from model_bakery import baker
+from rest_framework import status
+
+from recruitment.models import (
+    Applicant, ApplicantDocument, ApplicationDate, ApplicationStage)
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def make_document(application_date, content=b'%PDF-1.4 test'):
+    applicant = baker.make(Applicant, application_date=application_date)
+    files = {field: ContentFile(content + field.encode(), name=f'{field}.pdf')
+             for field in ApplicantDocument.FILE_FIELDS}
+    return baker.make(ApplicantDocument, applicant=applicant, **files)
+
+
+def read_zip(response):
+    return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('media_root')
+class TestApplicantDocumentBundle:
+    """ If you don't want field validation use Model Baker """
+
+    def test_if_user_can_download_applicant_documents_return_200(self, superuser_client):
+        application_date = baker.make(ApplicationDate)
+        document = make_document(application_date)
+
+        response = superuser_client.get(
+            f'/recruitment/applicant-documents/{document.pk}/download/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/zip'
+        archive = read_zip(response)
+        folder = f'{document.applicant.id_number}-{document.pk}'
+        assert sorted(archive.namelist()) == sorted(
+            f'{folder}/{field}.pdf' for field in ApplicantDocument.FILE_FIELDS)
+        assert archive.read(f'{folder}/resume.pdf') == b'%PDF-1.4 testresume'
+        assert archive.testzip() is None
+
+    def test_if_bundle_by_application_date_return_200(self, superuser_client):
+        application_date = baker.make(ApplicationDate)
+        documents = [make_document(application_date) for _ in range(2)]
+        make_document(baker.make(ApplicationDate))
+
+        response = superuser_client.get(
+            f'/recruitment/applicant-documents/bundle/?application_date={application_date.pk}')
+
+        assert response.status_code == status.HTTP_200_OK
+        folders = {name.split('/')[0] for name in read_zip(response).namelist()}
+        assert folders == {f'{doc.applicant.id_number}-{doc.pk}' for doc in documents}
+
+    def test_if_bundle_by_stage_skips_missing_files_return_200(self, superuser_client):
+        application_date = baker.make(ApplicationDate)
+        stage = baker.make(ApplicationStage, application_date=application_date)
+        document = make_document(application_date)
+        make_document(application_date)
+        stage.applicants.add(document.applicant)
+        os.remove(document.resume.path)
+
+        response = superuser_client.get(
+            f'/recruitment/applicant-documents/bundle/?stage={stage.pk}')
+
+        assert response.status_code == status.HTTP_200_OK
+        names = read_zip(response).namelist()
+        assert len(names) == len(ApplicantDocument.FILE_FIELDS) - 1
+        assert not any(name.endswith('/resume.pdf') for name in names)
+
+    def test_if_bundle_without_filter_return_400(self, superuser_client):
+        response = superuser_client.get('/recruitment/applicant-documents/bundle/')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize('params', ['stage=abc', 'application_date=1"%0d%0aX-Evil:1', 'stage=-1'])
+    def test_if_bundle_filter_is_not_an_id_return_400(self, params, superuser_client):
+        response = superuser_client.get(f'/recruitment/applicant-documents/bundle/?{params}')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
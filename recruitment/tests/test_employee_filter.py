@@ -0,0 +1,94 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from rest_framework import status
+
+from recruitment.models import Employee
+
+EMPLOYEES_ENDPOINT = '/recruitment/employees/'
+FACETS_ENDPOINT = '/recruitment/employees/facets/'
+
+
+@pytest.fixture
+def employees():
+    return [
+        baker.make(Employee, religion='Christian', gender='Male', county='Bong',
+                   qualification='Bachelor', employment='Full Timer'),
+        baker.make(Employee, religion='Christian', gender='Female', county='Bong',
+                   qualification='Master', employment='Full Timer'),
+        baker.make(Employee, religion='Muslim', gender='Male', county='Lofa',
+                   qualification='Bachelor', employment='Internship'),
+    ]
+
+
+def employee_ids(response):
+    return sorted(employee['user']['id'] for employee in response.data)
+
+
+def facet(response, field):
+    return {row['value']: row['count'] for row in response.data[field]}
+
+
+@pytest.mark.django_db
+class TestEmployeeFilter:
+    """ If you don't want field validation use Model Baker """
+
+    def test_if_choice_filters_match_exactly_return_200(self, employees, superuser_client):
+        response = superuser_client.get(f'{EMPLOYEES_ENDPOINT}?religion=Christian&county=Bong&gender=Male')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert employee_ids(response) == [employees[0].pk]
+
+    def test_if_filter_is_repeated_match_any_value_return_200(self, employees, superuser_client):
+        response = superuser_client.get(f'{EMPLOYEES_ENDPOINT}?qualification=Master&qualification=PhD')
+
+        assert employee_ids(response) == [employees[1].pk]
+
+    def test_if_choice_is_invalid_return_400(self, superuser_client):
+        response = superuser_client.get(f'{EMPLOYEES_ENDPOINT}?religion=Christ')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_if_search_param_is_ignored_return_200(self, employees, superuser_client):
+        response = superuser_client.get(f'{EMPLOYEES_ENDPOINT}?search=Muslim')
+
+        assert len(response.data) == 3
+
+
+@pytest.mark.django_db
+class TestEmployeeFacets:
+    def test_if_every_choice_is_counted_return_200(self, employees, superuser_client):
+        response = superuser_client.get(FACETS_ENDPOINT)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert facet(response, 'religion') == {'Christian': 2, 'Muslim': 1, 'None': 0}
+        assert facet(response, 'employment') == {'Internship': 1, 'Part Timer': 0, 'Full Timer': 2}
+        assert len(response.data['county']) == len(Employee.COUNTY_CHOICES)
+        assert facet(response, 'county')['Lofa'] == 1
+
+    def test_if_filtered_field_keeps_its_other_values_return_200(self, employees, superuser_client):
+        response = superuser_client.get(f'{FACETS_ENDPOINT}?religion=Christian')
+
+        assert facet(response, 'religion') == {'Christian': 2, 'Muslim': 1, 'None': 0}
+        assert facet(response, 'gender') == {'Male': 1, 'Female': 1}
+        assert facet(response, 'county')['Lofa'] == 0
+
+    def test_if_other_filters_apply_return_200(self, employees, superuser_client):
+        employees[2].supervisor = employees[0]
+        employees[2].save()
+        response = superuser_client.get(f'{FACETS_ENDPOINT}?supervisor={employees[0].pk}')
+
+        assert facet(response, 'religion') == {'Christian': 0, 'Muslim': 1, 'None': 0}
+
+    def test_if_choice_is_invalid_return_400(self, superuser_client):
+        response = superuser_client.get(f'{FACETS_ENDPOINT}?gender=Other')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_if_facets_are_one_query(self, employees, superuser_client):
+        with CaptureQueriesContext(connection) as context:
+            superuser_client.get(f'{FACETS_ENDPOINT}?religion=Christian&county=Bong')
+
+        assert len([query for query in context.captured_queries
+                    if 'recruitment_employee' in query['sql']]) == 1
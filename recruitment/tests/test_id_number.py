@@ -0,0 +1,36 @@
+import pytest
+from model_bakery import baker
+
+from recruitment import utilities
+from recruitment.models import Applicant, ApplicationDate, IdNumberSequence
+
+
+@pytest.mark.django_db
+class TestIdNumber:
+    """ Applicant and Pyp id_number come from the IdNumberSequence counter """
+
+    def test_if_numbers_are_sequential(self):
+        baker.make(ApplicationDate)
+        first, second = baker.make(Applicant, _quantity=2)
+
+        assert first.id_number == '001'
+        assert second.id_number == '002'
+
+    def test_if_counter_is_seeded_numerically(self):
+        """ MAX() over the text column would say '999' > '1000' """
+        baker.make(ApplicationDate)
+        baker.make(Applicant, id_number='999')
+        baker.make(Applicant, id_number='1000')
+        IdNumberSequence.objects.all().delete()
+
+        assert utilities.applicant_id_number_generator() == '1001'
+
+    @pytest.mark.django_db(transaction=True)
+    def test_if_block_allocation_reserves_numbers_once(self, settings, monkeypatch):
+        """ Blocks are only kept outside of an atomic block """
+        settings.ID_NUMBER_BLOCK_SIZE = 10
+        monkeypatch.setattr(utilities, '_id_number_blocks', {})
+        numbers = [utilities.pyp_id_number_generator() for _ in range(12)]
+
+        assert numbers == [str(n).zfill(3) for n in range(1, 13)]
+        assert IdNumberSequence.objects.get(name='Pyp').last_value == 20
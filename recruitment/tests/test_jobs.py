@@ -0,0 +1,90 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from recruitment import jobs
+from recruitment.models import Job
+
+
+@pytest.fixture
+def tasks(monkeypatch):
+    calls = []
+
+    def record(**payload):
+        calls.append(payload)
+
+    def fail(**payload):
+        raise ValueError('broken')
+
+    monkeypatch.setitem(jobs.TASKS, 'record', record)
+    monkeypatch.setitem(jobs.TASKS, 'fail', fail)
+    return calls
+
+
+def run_jobs():
+    call_command('run_jobs', '--once', '--workers', '0', stdout=io.StringIO())
+
+
+@pytest.mark.django_db
+class TestJobs:
+
+    def test_if_pending_job_is_run(self, tasks):
+        job = jobs.enqueue('record', name='resume.pdf')
+
+        run_jobs()
+
+        job.refresh_from_db()
+        assert job.status == 'Done'
+        assert tasks == [{'name': 'resume.pdf'}]
+
+    def test_if_failed_job_is_retried_later(self, tasks):
+        job = jobs.enqueue('fail')
+
+        run_jobs()
+
+        job.refresh_from_db()
+        assert job.status == 'Pending'
+        assert job.attempts == 1
+        assert 'ValueError: broken' in job.last_error
+        # Not due yet
+        assert jobs.claim_jobs(10) == []
+
+    def test_if_job_fails_after_max_attempts(self, tasks):
+        job = jobs.enqueue('fail')
+        Job.objects.filter(pk=job.pk).update(attempts=jobs.MAX_ATTEMPTS - 1)
+
+        run_jobs()
+
+        job.refresh_from_db()
+        assert job.status == 'Failed'
+
+    def test_if_claimed_job_is_not_claimed_again(self, tasks):
+        job = jobs.enqueue('record')
+
+        assert jobs.claim_jobs(10) == [job.pk]
+        assert jobs.claim_jobs(10) == []
+
+    def test_if_job_of_stopped_worker_is_claimed_again(self, tasks):
+        job = jobs.enqueue('record')
+        jobs.claim_jobs(10)
+        Job.objects.filter(pk=job.pk).update(claimed_at=timezone.now() - jobs.LEASE)
+
+        assert jobs.claim_jobs(10) == [job.pk]
+        job.refresh_from_db()
+        assert job.status == 'Running'
+        assert job.attempts == 2
+
+    def test_if_job_keeps_stopping_its_worker_it_fails(self, tasks):
+        job = jobs.enqueue('record')
+        Job.objects.filter(pk=job.pk).update(
+            status='Running', attempts=jobs.MAX_ATTEMPTS, claimed_at=timezone.now() - jobs.LEASE)
+
+        assert jobs.claim_jobs(10) == []
+        job.refresh_from_db()
+        assert job.status == 'Failed'
+
+    def test_if_unknown_task_cannot_be_enqueued(self):
+        with pytest.raises(KeyError):
+            jobs.enqueue('missing')
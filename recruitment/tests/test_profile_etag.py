@@ -0,0 +1,97 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from rest_framework import status
+
+from recruitment.models import (
+    Applicant, ApplicantAddress, ApplicantContact, ApplicantDocument,
+    ApplicationDate, ApplicationStage, Employee, EmployeeContact)
+
+
+@pytest.fixture
+def applicant():
+    application_date = baker.make(ApplicationDate)
+    applicant = baker.make(Applicant, application_date=application_date)
+    baker.make(ApplicantDocument, applicant=applicant)
+    baker.make(ApplicantAddress, applicant=applicant)
+    baker.make(ApplicantContact, applicant=applicant, _quantity=2)
+    return applicant
+
+
+def profile(client, applicant, etag=None):
+    headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+    return client.get(f'/recruitment/applicant-profile/{applicant.pk}/', **headers)
+
+
+@pytest.mark.django_db
+class TestProfileETag:
+    """ If you don't want field validation use Model Baker """
+
+    def test_if_etag_matches_return_304(self, superuser_client, applicant):
+        etag = profile(superuser_client, applicant)['ETag']
+
+        with CaptureQueriesContext(connection) as context:
+            response = profile(superuser_client, applicant, etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+        assert len(context.captured_queries) == 1
+
+    def test_if_other_host_gets_another_etag_return_200(self, superuser_client, applicant, settings):
+        settings.ALLOWED_HOSTS = ['testserver', 'other.example.com']
+        etag = profile(superuser_client, applicant)['ETag']
+
+        response = superuser_client.get(f'/recruitment/applicant-profile/{applicant.pk}/',
+                                        HTTP_HOST='other.example.com', HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_if_related_change_changes_etag_return_200(self, superuser_client, applicant):
+        etag = profile(superuser_client, applicant)['ETag']
+
+        address = applicant.address
+        address.community = 'Another community'
+        address.save()
+        response = profile(superuser_client, applicant, etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_if_deleted_contact_changes_etag_return_200(self, superuser_client, applicant):
+        etag = profile(superuser_client, applicant)['ETag']
+
+        applicant.contacts.first().delete()
+        response = profile(superuser_client, applicant, etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data['contacts']) == 1
+
+    def test_if_bulk_screening_changes_etag_return_200(self, superuser_client, applicant):
+        stage = baker.make(ApplicationStage, application_date=applicant.application_date,
+                           order=1, is_current=True)
+        stage.applicants.add(applicant)
+        etag = profile(superuser_client, applicant)['ETag']
+
+        superuser_client.post('/recruitment/applicant-screenings/', {'applicants': [
+            {'applicant': applicant.pk, 'stage': stage.pk, 'status': 'Pending'}]}, format='json')
+        response = profile(superuser_client, applicant, etag)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['status'] == 'Pending'
+
+    def test_if_employee_etag_matches_return_304(self, superuser_client):
+        employee = baker.make(Employee)
+        baker.make(EmployeeContact, employee=employee)
+        url = f'/recruitment/employee-profile/{employee.pk}/'
+        etag = superuser_client.get(url)['ETag']
+
+        response = superuser_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_if_profile_does_not_exist_return_404(self, superuser_client):
+        response = superuser_client.get('/recruitment/applicant-profile/999/')
+
+        assert response.status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,67 @@
+import pytest
+from rest_framework import status
+from model_bakery import baker
+
+from core.models import User
+from recruitment.models import Applicant, ApplicationDate, ApplicationStage
+from recruitment.serializers import ApplicantSerializer
+
+
+QUALIFY_APPLICANT_ENDPOINT = '/recruitment/application-stages/'
+
+
+@pytest.mark.django_db
+class TestQualifyApplicant:
+    """ If you don't want field validation use Model Baker """
+
+    def make_board(self, quantity):
+        application_date = baker.make(ApplicationDate)
+        stage = baker.make(ApplicationStage, name='Publicity',
+                           order=1, is_current=True)
+        applicants = baker.make(
+            Applicant, status='Under review', current_stage=stage,
+            application_date=application_date, _quantity=quantity)
+        stage.applicants.add(*applicants)
+        return stage
+
+    def test_if_board_returns_current_stage_return_200(self, superuser_client):
+        stage = self.make_board(2)
+        response = superuser_client.get(QUALIFY_APPLICANT_ENDPOINT)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data) == 2
+        assert response.data[0]['stage_id'] == stage.id
+        assert response.data[0]['stage_name'] == 'Publicity'
+
+    def test_if_board_query_count_does_not_grow_with_applicants(
+            self, superuser_client, django_assert_num_queries):
+        self.make_board(5)
+        # The current stage id and the applicants
+        with django_assert_num_queries(2):
+            superuser_client.get(QUALIFY_APPLICANT_ENDPOINT)
+
+    def test_if_no_current_stage_returns_empty_board_return_200(self, superuser_client):
+        response = superuser_client.get(QUALIFY_APPLICANT_ENDPOINT)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == []
+
+    def test_if_new_applicant_starts_in_current_stage(self):
+        baker.make(ApplicationDate)
+        stage = baker.make(ApplicationStage, order=1, is_current=True)
+        applicant = ApplicantSerializer().create({
+            'user': baker.make(User), 'birth_date': '2000-01-01', 'gender': 'Male',
+            'religion': 'None', 'county': 'Bong', 'image': 'recruitment/images/1.jpg'})
+
+        assert applicant.current_stage == stage
+        assert list(stage.applicants.all()) == [applicant]
+
+    def test_if_other_stage_applicants_are_not_on_board_return_200(self, superuser_client):
+        stage = self.make_board(1)
+        old_stage = baker.make(ApplicationStage, application_date=stage.application_date,
+                               order=0, is_current=False)
+        baker.make(Applicant, status='Pending', current_stage=old_stage,
+                   application_date=stage.application_date)
+        response = superuser_client.get(QUALIFY_APPLICANT_ENDPOINT)
+
+        assert [row['stage_id'] for row in response.data] == [stage.id]
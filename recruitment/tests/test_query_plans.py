@@ -0,0 +1,154 @@
+import re
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+
+from recruitment.models import (
+    Applicant, ApplicantAddress, ApplicantContact, ApplicantDocument,
+    ApplicationDate, ApplicationStage, Employee, EmployeeAddress,
+    EmployeeContact, EmployeeDocument)
+
+
+# 'SCAN table' without an index. 'SCAN table USING [COVERING] INDEX' is
+# an index walk [e.g. ORDER BY served by the index] and is fine.
+FULL_SCAN = re.compile(r'^SCAN (\S+)$')
+TEMP_SORT = 'USE TEMP B-TREE FOR ORDER BY'
+
+
+def explain(sql):
+    """ 'sql' is the captured query, its params are already inlined """
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def plan_problems(captured_queries):
+    """
+    Re-run every captured statement under EXPLAIN QUERY PLAN and return
+    the ones that full scan a table or sort it in a temp b-tree.
+
+    A list endpoint without a WHERE clause has to read the whole table
+    anyway, so only the sort is checked for it.
+    """
+    problems = []
+    for query in captured_queries:
+        sql = query['sql'].strip()
+        if not sql.startswith(('SELECT', 'INSERT', 'UPDATE', 'DELETE')):
+            continue
+
+        has_where = ' WHERE ' in sql
+        for detail in explain(sql):
+            if (has_where and FULL_SCAN.match(detail)) or detail == TEMP_SORT:
+                problems.append(f'{detail}\n    {sql}')
+    return problems
+
+
+@pytest.fixture
+def sqlite_only():
+    if connection.vendor != 'sqlite':
+        pytest.skip('EXPLAIN QUERY PLAN output is SQLite specific')
+
+
+@pytest.fixture
+def recruitment_data():
+    """
+    If you don't want field validation use Model Baker.
+    One current recruitment with its applicants in the first stage and
+    a supervisor with two supervisees.
+    """
+    application_date = baker.make(ApplicationDate)
+    stage = baker.make(ApplicationStage, application_date=application_date,
+                       name='Publicity', order=1, is_current=True)
+    baker.make(ApplicationStage, application_date=application_date,
+               name='Credential varification', order=2)
+    applicants = baker.make(Applicant, application_date=application_date,
+                            current_stage=stage, _quantity=3)
+    stage.applicants.add(*applicants)
+    for applicant in applicants:
+        baker.make(ApplicantDocument, applicant=applicant)
+        baker.make(ApplicantAddress, applicant=applicant)
+        baker.make(ApplicantContact, applicant=applicant)
+
+    supervisor = baker.make(Employee)
+    employees = baker.make(Employee, supervisor=supervisor, _quantity=2)
+    for employee in employees:
+        baker.make(EmployeeDocument, employee=employee)
+        baker.make(EmployeeAddress, employee=employee)
+        baker.make(EmployeeContact, employee=employee)
+
+    return {'application_date': application_date.pk, 'stage': stage.pk,
+            'applicant': applicants[0].pk, 'applicants': applicants,
+            'supervisor': supervisor.pk, 'employee': employees[0].pk}
+
+
+ENDPOINTS = [
+    '/recruitment/application-dates/',
+    '/recruitment/application-dates/{application_date}/',
+    '/recruitment/application-stages/',
+    '/recruitment/applicants/',
+    '/recruitment/applicants/{applicant}/',
+    '/recruitment/applicants/{applicant}/contacts/',
+    '/recruitment/applicant-documents/',
+    '/recruitment/applicant-documents/{applicant}/',
+    '/recruitment/applicant-address/',
+    '/recruitment/applicant-address/{applicant}/',
+    '/recruitment/applicant-contacts/',
+    '/recruitment/applicant-profile/{applicant}/',
+    '/recruitment/employees/',
+    '/recruitment/employees/{employee}/',
+    '/recruitment/employees/?supervisor={supervisor}',
+    '/recruitment/employees/?religion=Muslim',
+    '/recruitment/employees/{employee}/contacts/',
+    '/recruitment/employee-documents/',
+    '/recruitment/employee-address/',
+    '/recruitment/employee-supervisors/',
+    '/recruitment/employee-profile/{employee}/',
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('sqlite_only')
+class TestQueryPlans:
+    """
+    Fails when an endpoint query starts full scanning a table, i.e. a
+    filter lost its index. Add the index to the model Meta when it does.
+    """
+
+    @pytest.mark.parametrize('endpoint', ENDPOINTS)
+    def test_if_get_endpoint_uses_indexes(self, endpoint, recruitment_data, superuser_client):
+        with CaptureQueriesContext(connection) as context:
+            response = superuser_client.get(
+                endpoint.format(**recruitment_data))
+
+        assert response.status_code == 200
+        assert plan_problems(context.captured_queries) == []
+
+    def test_if_screening_uses_indexes(self, recruitment_data, superuser_client):
+        data = {'applicants': [
+            {'applicant': applicant.pk, 'stage': recruitment_data['stage'],
+             'status': 'Pending'}
+            for applicant in recruitment_data['applicants']]}
+        with CaptureQueriesContext(connection) as context:
+            response = superuser_client.post(
+                '/recruitment/applicant-screenings/', data, format='json')
+
+        assert response.status_code == 201
+        assert plan_problems(context.captured_queries) == []
+
+    @pytest.mark.parametrize('statuses', [['Pending'], ['Under review', 'Pending']])
+    def test_if_status_filter_uses_status_index(self, statuses, recruitment_data):
+        with CaptureQueriesContext(connection) as context:
+            list(Applicant.objects.filter(status__in=statuses))
+
+        assert any('applicant_status_idx' in detail
+                   for detail in explain(context.captured_queries[0]['sql']))
+
+    def test_if_board_uses_stage_status_index(self, recruitment_data, superuser_client):
+        with CaptureQueriesContext(connection) as context:
+            superuser_client.get('/recruitment/application-stages/')
+
+        applicants = [query['sql'] for query in context.captured_queries
+                      if 'FROM "recruitment_applicant"' in query['sql']]
+        assert len(applicants) == 1
+        assert any('applicant_stage_status_idx' in detail for detail in explain(applicants[0]))
@@ -0,0 +1,92 @@
+import pytest
+from django.contrib.auth.models import Permission
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from model_bakery import baker
+from rest_framework import status
+
+from core.cache import get_version
+from recruitment.models import ApplicationDate, ApplicationStage
+
+
+def cached_get(client, endpoint):
+    """ Second GET of 'endpoint' and the queries it ran """
+    client.get(endpoint)
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(endpoint)
+    return response, context.captured_queries
+
+
+@pytest.mark.django_db
+class TestVersionedCache:
+    """ If you don't want field validation use Model Baker """
+
+    @pytest.mark.parametrize('endpoint', ['/recruitment/application-dates/',
+                                          '/recruitment/stages/',
+                                          '/core/permissions/'])
+    def test_if_second_get_is_served_from_cache_return_200(self, endpoint, superuser_client):
+        baker.make(ApplicationStage, application_date=baker.make(ApplicationDate))
+
+        response, queries = cached_get(superuser_client, endpoint)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert queries == []
+
+    def test_if_saved_application_date_is_seen_return_200(self, superuser_client, django_capture_on_commit_callbacks):
+        application_date = baker.make(ApplicationDate)
+        superuser_client.get('/recruitment/application-dates/')
+
+        with django_capture_on_commit_callbacks(execute=True):
+            baker.make(ApplicationDate)
+        response = superuser_client.get('/recruitment/application-dates/')
+
+        assert len(response.data) == 2
+        assert [date['is_current'] for date in response.data].count(True) == 1
+        assert application_date.pk in [date['id'] for date in response.data]
+
+    def test_if_stage_change_is_seen_return_200(self, superuser_client, django_capture_on_commit_callbacks):
+        stage = baker.make(ApplicationStage, application_date=baker.make(ApplicationDate),
+                           is_current=False)
+        endpoint = f'/recruitment/stages/?application_date={stage.application_date_id}'
+        superuser_client.get(endpoint)
+
+        stage.is_current = True
+        with django_capture_on_commit_callbacks(execute=True):
+            stage.save()
+        response = superuser_client.get(endpoint)
+
+        assert response.data[0]['is_current'] is True
+
+    def test_if_version_is_bumped_after_commit(self, django_capture_on_commit_callbacks):
+        stage = baker.make(ApplicationStage, application_date=baker.make(ApplicationDate))
+        version = get_version(ApplicationStage.CACHE_NAMESPACE)
+        with django_capture_on_commit_callbacks() as callbacks:
+            stage.save()
+            # A request reading before the COMMIT still sees the old rows
+            assert get_version(ApplicationStage.CACHE_NAMESPACE) == version
+
+        for callback in callbacks:
+            callback()
+
+        assert get_version(ApplicationStage.CACHE_NAMESPACE) != version
+
+    def test_if_filters_are_cached_apart_return_200(self, superuser_client):
+        stages = [baker.make(ApplicationStage, application_date=baker.make(ApplicationDate))
+                  for _ in range(2)]
+
+        first = superuser_client.get(f'/recruitment/stages/?application_date={stages[0].application_date_id}')
+        second = superuser_client.get(f'/recruitment/stages/?application_date={stages[1].application_date_id}')
+
+        assert [stage['id'] for stage in first.data] == [stages[0].pk]
+        assert [stage['id'] for stage in second.data] == [stages[1].pk]
+
+    def test_if_new_permission_is_seen_return_200(self, superuser_client, django_capture_on_commit_callbacks):
+        count = len(superuser_client.get('/core/permissions/').data)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Permission.objects.create(codename='export_applicant', name='Can export applicant',
+                                      content_type=ContentType.objects.get(model='applicant'))
+        response = superuser_client.get('/core/permissions/')
+
+        assert len(response.data) == count + 1
@@ -0,0 +1,127 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from model_bakery import baker
+
+from recruitment.models import (
+    Applicant, ApplicationDate, ApplicationStage, Screening)
+from recruitment.serializers import BulkScreeningSerializer
+
+
+SCREENING_ENDPOINT = '/recruitment/applicant-screenings/'
+
+
+@pytest.mark.django_db
+class TestApplicantScreening:
+    """
+    If you don't want field validation use Model Baker.
+    The applicants are in the first stage and screening moves the
+    qualified ones to the second stage.
+    """
+
+    def make_stage(self, quantity):
+        application_date = baker.make(ApplicationDate)
+        stage = baker.make(ApplicationStage, application_date=application_date,
+                           order=1, is_current=True)
+        baker.make(ApplicationStage, application_date=application_date, order=2)
+        applicants = baker.make(Applicant, application_date=application_date,
+                                status='Under review', current_stage=stage, _quantity=quantity)
+        stage.applicants.add(*applicants)
+        return stage, applicants
+
+    def payload(self, stage, applicants, applicant_status='Pending'):
+        return {'applicants': [
+            {'applicant': applicant.pk, 'stage': stage.pk,
+             'status': applicant_status}
+            for applicant in applicants]}
+
+    def test_if_batch_is_screened_return_201(self, superuser_client):
+        stage, applicants = self.make_stage(3)
+        response = superuser_client.post(
+            SCREENING_ENDPOINT, self.payload(stage, applicants), format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data['screened'] == 3
+        assert [row['applicant'] for row in response.data['results']] == [
+            applicant.pk for applicant in applicants]
+        assert Screening.objects.count() == 3
+        assert set(Applicant.objects.values_list(
+            'status', flat=True)) == {'Pending'}
+
+    def test_if_invalid_row_rejects_whole_batch_return_400(self, superuser_client):
+        stage, applicants = self.make_stage(2)
+        data = self.payload(stage, applicants)
+        data['applicants'][1]['applicant'] = 0
+        response = superuser_client.post(
+            SCREENING_ENDPOINT, data, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data['applicants'][0] == {}
+        assert 'applicant' in response.data['applicants'][1]
+        assert Screening.objects.count() == 0
+
+    def test_if_screening_query_count_does_not_grow_with_batch(self):
+        stage, applicants = self.make_stage(20)
+        small_batch = BulkScreeningSerializer(
+            data=self.payload(stage, applicants[:2]))
+        big_batch = BulkScreeningSerializer(
+            data=self.payload(stage, applicants[2:]))
+
+        with CaptureQueriesContext(connection) as small_batch_queries:
+            small_batch.is_valid(raise_exception=True)
+            small_batch.save()
+        with CaptureQueriesContext(connection) as big_batch_queries:
+            big_batch.is_valid(raise_exception=True)
+            big_batch.save()
+
+        assert len(big_batch_queries) == len(small_batch_queries)
+
+    def test_if_qualified_applicants_move_to_next_stage(self, superuser_client):
+        stage, applicants = self.make_stage(2)
+        data = self.payload(stage, applicants)
+        data['applicants'][1]['status'] = 'Unsuccessful'
+        superuser_client.post(SCREENING_ENDPOINT, data, format='json')
+        next_stage = ApplicationStage.objects.get(order=2)
+
+        assert next_stage.is_current
+        assert list(next_stage.applicants.values_list('pk', flat=True)) == [
+            applicants[0].pk]
+
+    def test_if_current_stage_follows_promotion(self, superuser_client):
+        stage, applicants = self.make_stage(2)
+        data = self.payload(stage, applicants)
+        data['applicants'][1]['status'] = 'Unsuccessful'
+        superuser_client.post(SCREENING_ENDPOINT, data, format='json')
+        next_stage = ApplicationStage.objects.get(order=2)
+
+        assert dict(Applicant.objects.values_list('pk', 'current_stage')) == {
+            applicants[0].pk: next_stage.pk, applicants[1].pk: stage.pk}
+
+    def test_if_previous_recruitment_applicants_are_not_promoted(self, superuser_client):
+        _, old_applicants = self.make_stage(1)
+        Applicant.objects.update(status='Pending')
+        ApplicationStage.objects.update(is_current=False)
+        stage, applicants = self.make_stage(1)
+        superuser_client.post(
+            SCREENING_ENDPOINT, self.payload(stage, applicants), format='json')
+        next_stage = ApplicationStage.objects.get(
+            application_date=stage.application_date, order=2)
+
+        assert list(next_stage.applicants.values_list('pk', flat=True)) == [
+            applicants[0].pk]
+
+    def test_if_promotion_query_count_does_not_grow(self, superuser_client):
+        stage, applicants = self.make_stage(2)
+        with CaptureQueriesContext(connection) as small_batch:
+            superuser_client.post(
+                SCREENING_ENDPOINT, self.payload(stage, applicants), format='json')
+
+        ApplicationDate.objects.update(is_current=False)
+        ApplicationStage.objects.update(is_current=False)
+        stage, applicants = self.make_stage(20)
+        with CaptureQueriesContext(connection) as big_batch:
+            superuser_client.post(
+                SCREENING_ENDPOINT, self.payload(stage, applicants), format='json')
+
+        assert len(big_batch) == len(small_batch)
@@ -0,0 +1,129 @@
+import itertools
+
+import pytest
+from django.db import connection
+from model_bakery import baker
+from rest_framework import status
+
+from core.models import User
+from recruitment import search
+from recruitment.models import Applicant, ApplicantAddress, ApplicantDocument, ApplicationDate
+
+APPLICANTS_ENDPOINT = '/recruitment/applicants/'
+email_numbers = itertools.count()
+
+
+@pytest.fixture
+def search_index(db):
+    search.create_search_index(Applicant)
+    yield
+    search.drop_search_index()
+
+
+def make_applicant(first_name, last_name, institution='Cuttington University',
+                   community='Sinkor', **kwargs):
+    user = baker.make(User, first_name=first_name, last_name=last_name,
+                      email=f'{first_name}.{last_name}{next(email_numbers)}@gmail.com'.lower())
+    applicant = baker.make(Applicant, user=user, application_date=baker.make(ApplicationDate),
+                           county='Bong', **kwargs)
+    baker.make(ApplicantDocument, applicant=applicant, institution=institution,
+               major='Computer Science')
+    baker.make(ApplicantAddress, applicant=applicant, county='Montserrado',
+               community=community)
+    return applicant
+
+
+def result_ids(response):
+    return [applicant['user']['id'] for applicant in response.data['results']]
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('search_index')
+class TestApplicantSearch:
+    """ If you don't want field validation use Model Baker """
+
+    def test_if_name_prefix_matches_return_200(self, superuser_client):
+        applicant = make_applicant('Comfort', 'Kollie')
+        make_applicant('Moses', 'Flomo')
+        response = superuser_client.get(f'{APPLICANTS_ENDPOINT}?q=comf')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert result_ids(response) == [applicant.pk]
+
+    def test_if_every_term_must_match_return_200(self, superuser_client):
+        applicant = make_applicant('Comfort', 'Kollie', institution='University of Liberia')
+        make_applicant('Comfort', 'Flomo')
+        response = superuser_client.get(f'{APPLICANTS_ENDPOINT}?q=comfort liberia')
+
+        assert result_ids(response) == [applicant.pk]
+
+    def test_if_name_match_ranks_first_return_200(self, superuser_client):
+        by_community = make_applicant('Moses', 'Flomo', community='Paynesville')
+        by_name = make_applicant('Paynes', 'Kollie')
+        response = superuser_client.get(f'{APPLICANTS_ENDPOINT}?q=paynes')
+
+        assert result_ids(response) == [by_name.pk, by_community.pk]
+
+    @pytest.mark.parametrize('terms', ['moses.flomo@gmail', 'cuttington', 'computer', 'montserrado'])
+    def test_if_other_fields_match_return_200(self, terms, superuser_client):
+        applicant = make_applicant('Moses', 'Flomo')
+        response = superuser_client.get(APPLICANTS_ENDPOINT, {'q': terms})
+
+        assert result_ids(response) == [applicant.pk]
+
+    def test_if_id_number_matches_return_200(self, superuser_client):
+        applicant = make_applicant('Moses', 'Flomo')
+        response = superuser_client.get(APPLICANTS_ENDPOINT, {'q': applicant.id_number})
+
+        assert result_ids(response) == [applicant.pk]
+
+    def test_if_related_changes_are_indexed_return_200(self, superuser_client):
+        applicant = make_applicant('Moses', 'Flomo')
+        applicant.user.first_name = 'Sekou'
+        applicant.user.save()
+        applicant.document.institution = 'Stella Maris Polytechnic'
+        applicant.document.save()
+
+        assert result_ids(superuser_client.get(f'{APPLICANTS_ENDPOINT}?q=sekou stella')) == [applicant.pk]
+        assert result_ids(superuser_client.get(f'{APPLICANTS_ENDPOINT}?q=cuttington')) == []
+
+    def test_if_deleted_applicant_is_removed_return_200(self, superuser_client):
+        applicant = make_applicant('Moses', 'Flomo')
+        applicant.delete()
+
+        assert search.ranked_applicant_ids('moses', 10) == []
+
+    def test_if_page_size_limits_results_return_200(self, superuser_client):
+        for _ in range(3):
+            make_applicant('Moses', 'Flomo')
+        response = superuser_client.get(f'{APPLICANTS_ENDPOINT}?q=moses&page_size=2')
+
+        assert len(response.data['results']) == 2
+
+    def test_if_only_newest_candidates_are_ranked_return_200(self, superuser_client, monkeypatch):
+        make_applicant('Paynes', 'Kollie')
+        by_community = make_applicant('Moses', 'Flomo', community='Paynesville')
+        newest = make_applicant('Sekou', 'Flomo', community='Paynesville')
+        monkeypatch.setattr(search, 'SEARCH_CANDIDATES', 2)
+        response = superuser_client.get(f'{APPLICANTS_ENDPOINT}?q=paynes&page_size=2')
+
+        # The better ranked name match is older than the 2 candidates
+        assert sorted(result_ids(response)) == [by_community.pk, newest.pk]
+
+    def test_if_search_query_count_does_not_grow(self, superuser_client, django_assert_max_num_queries):
+        for _ in range(10):
+            make_applicant('Moses', 'Flomo')
+        # The FTS query, the applicants and their contacts
+        with django_assert_max_num_queries(3):
+            superuser_client.get(f'{APPLICANTS_ENDPOINT}?q=moses')
+
+
+@pytest.mark.django_db
+class TestApplicantSearchFallback:
+    def test_if_index_is_missing_search_with_like_return_200(self, superuser_client):
+        applicant = make_applicant('Comfort', 'Kollie')
+        make_applicant('Moses', 'Flomo')
+        response = superuser_client.get(f'{APPLICANTS_ENDPOINT}?q=comf')
+
+        assert not search.search_available(connection.alias)
+        assert result_ids(response) == [applicant.pk]
@@ -0,0 +1,104 @@
+import os
+
+import pytest
+from django.core.files.base import ContentFile
+from model_bakery import baker
+
+from recruitment.models import (
+    Applicant, ApplicantDocument, ApplicationDate, StoredBlob)
+from recruitment.storage import BLOB_PREFIX, document_storage
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def make_document(application_date, degree=b'%PDF-1.4 degree'):
+    applicant = baker.make(Applicant, application_date=application_date)
+    files = {field: ContentFile(f'%PDF-1.4 {field} {applicant.pk}'.encode(), name=f'{field}.pdf')
+             for field in ApplicantDocument.FILE_FIELDS}
+    files['degree'] = ContentFile(degree, name='my degree.PDF')
+    return baker.make(ApplicantDocument, applicant=applicant, **files)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.usefixtures('media_root')
+class TestContentAddressedStorage:
+    """
+    If you don't want field validation use Model Baker.
+    transaction=True because the blob files are removed on commit.
+    """
+
+    def test_if_same_file_is_stored_once(self):
+        application_date = baker.make(ApplicationDate)
+        first = make_document(application_date)
+        second = make_document(application_date)
+
+        assert first.degree.name == second.degree.name
+        assert first.degree.name.startswith(f'{BLOB_PREFIX}/')
+        assert first.degree.name.endswith('.pdf')
+        assert StoredBlob.objects.get(name=first.degree.name).references == 2
+        with first.degree.open('rb') as degree:
+            assert degree.read() == b'%PDF-1.4 degree'
+
+    def test_if_blob_is_removed_with_its_last_reference(self):
+        application_date = baker.make(ApplicationDate)
+        first = make_document(application_date)
+        second = make_document(application_date)
+        path = first.degree.path
+
+        first.delete()
+        assert os.path.exists(path)
+        assert StoredBlob.objects.get(name=second.degree.name).references == 1
+
+        second.delete()
+        assert not os.path.exists(path)
+        assert not StoredBlob.objects.filter(name=second.degree.name).exists()
+
+    def test_if_replaced_file_is_released(self):
+        document = make_document(baker.make(ApplicationDate))
+        old_path = document.degree.path
+
+        document.degree = ContentFile(b'%PDF-1.4 new degree', name='degree.pdf')
+        document.save()
+
+        assert not os.path.exists(old_path)
+        assert os.path.exists(document.degree.path)
+        assert StoredBlob.objects.get(name=document.degree.name).references == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('media_root')
+class TestContentAddressedStorageRace:
+    """ A save of the same content while a delete commits, the commit is captured """
+
+    def test_if_save_before_delete_commits_keeps_the_file(self, django_capture_on_commit_callbacks):
+        content = b'%PDF-1.4 shared degree'
+        name = document_storage.save('degree.pdf', ContentFile(content))
+        path = document_storage.path(name)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            document_storage.delete(name)
+        assert len(callbacks) == 1
+        # Saved again before the delete's on_commit removal ran
+        assert document_storage.save('again.pdf', ContentFile(content)) == name
+        for callback in callbacks:
+            callback()
+
+        assert os.path.exists(path)
+        assert StoredBlob.objects.get(name=name).references == 1
+
+    def test_if_save_after_removal_writes_the_file_again(self, django_capture_on_commit_callbacks):
+        content = b'%PDF-1.4 shared degree'
+        name = document_storage.save('degree.pdf', ContentFile(content))
+        with django_capture_on_commit_callbacks(execute=True):
+            document_storage.delete(name)
+        assert not os.path.exists(document_storage.path(name))
+
+        document_storage.save('again.pdf', ContentFile(content))
+
+        with document_storage.open(name, 'rb') as degree:
+            assert degree.read() == content
+        assert StoredBlob.objects.get(name=name).references == 1
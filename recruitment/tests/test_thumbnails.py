@@ -0,0 +1,136 @@
+import io
+
+import pytest
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from model_bakery import baker
+from PIL import Image
+from rest_framework import status
+
+from recruitment.models import Applicant, ApplicationDate, Employee, Job
+from recruitment.thumbnails import THUMBNAIL_SIZES, thumbnail_name
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+def create_image(width=800, height=600, format='PNG'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), 'blue').save(buffer, format)
+    return ContentFile(buffer.getvalue(), name=f'photo.{format.lower()}')
+
+
+def run_jobs():
+    call_command('run_jobs', '--once', '--workers', '0', stdout=io.StringIO())
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('media_root')
+class TestThumbnails:
+    """ If you don't want field validation use Model Baker """
+
+    def test_if_thumbnails_are_created_on_upload(self):
+        applicant = baker.make(Applicant, application_date=baker.make(ApplicationDate),
+                               image=create_image())
+        run_jobs()
+
+        for pixels in THUMBNAIL_SIZES.values():
+            name = thumbnail_name(applicant.image.name, pixels)
+            with applicant.image.storage.open(name) as file, Image.open(file) as thumbnail:
+                assert thumbnail.format == 'WEBP'
+                assert max(thumbnail.size) == pixels
+
+    def test_if_saving_without_a_new_image_enqueues_nothing(self):
+        applicant = baker.make(Applicant, application_date=baker.make(ApplicationDate),
+                               image=create_image())
+        assert Job.objects.filter(task='create_thumbnails').count() == 1
+
+        applicant.religion = 'Muslim'
+        applicant.save()
+
+        assert Job.objects.filter(task='create_thumbnails').count() == 1
+
+    def test_if_replaced_image_is_deleted_by_a_job_return_200(self, superuser_client):
+        applicant = baker.make(Applicant, application_date=baker.make(ApplicationDate),
+                               image=create_image())
+        run_jobs()
+        storage = applicant.image.storage
+        old_names = [applicant.image.name] + [
+            thumbnail_name(applicant.image.name, pixels) for pixels in THUMBNAIL_SIZES.values()]
+
+        response = superuser_client.patch(f'/recruitment/applicants/{applicant.pk}/',
+                                          {'image': create_image(format='JPEG')}, format='multipart')
+        assert response.status_code == status.HTTP_200_OK
+        assert all(storage.exists(name) for name in old_names)
+
+        run_jobs()
+
+        applicant.refresh_from_db()
+        assert not any(storage.exists(name) for name in old_names)
+        assert storage.exists(thumbnail_name(applicant.image.name, THUMBNAIL_SIZES['small']))
+
+    def test_if_applicant_list_returns_thumbnails_return_200(self, superuser_client):
+        applicant = baker.make(Applicant, application_date=baker.make(ApplicationDate),
+                               image=create_image())
+        run_jobs()
+
+        response = superuser_client.get('/recruitment/applicants/?fields=user,thumbnails')
+
+        assert response.status_code == status.HTTP_200_OK
+        thumbnails = response.data['results'][0]['thumbnails']
+        assert set(thumbnails) == set(THUMBNAIL_SIZES)
+        assert thumbnails['small'].endswith(
+            thumbnail_name(applicant.image.name, THUMBNAIL_SIZES['small']))
+
+    def test_if_supervisors_return_thumbnails_return_200(self, superuser_client):
+        supervisor = baker.make(Employee, image=create_image(format='JPEG'))
+        baker.make(Employee, supervisor=supervisor)
+        run_jobs()
+
+        response = superuser_client.get('/recruitment/employee-supervisors/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data[0]['thumbnails']['large'].startswith('http://testserver/media/')
+        assert response.data[0]['thumbnails']['large'].endswith('-jpeg-320.webp')
+
+    def test_if_missing_thumbnails_fall_back_to_image_return_200(self, superuser_client):
+        applicant = baker.make(Applicant, application_date=baker.make(ApplicationDate),
+                               image=create_image())
+
+        response = superuser_client.get('/recruitment/applicants/?fields=user,thumbnails')
+
+        thumbnails = response.data['results'][0]['thumbnails']
+        assert set(thumbnails.values()) == {f'http://testserver{applicant.image.url}'}
+
+    def test_if_new_image_falls_back_until_its_thumbnails_exist(self):
+        applicant = baker.make(Applicant, application_date=baker.make(ApplicationDate),
+                               image=create_image())
+        run_jobs()
+        applicant.refresh_from_db()
+        assert applicant.has_thumbnails
+
+        applicant.image = create_image(format='JPEG')
+        applicant.save()
+        applicant.refresh_from_db()
+        assert not applicant.has_thumbnails
+
+        run_jobs()
+        applicant.refresh_from_db()
+        assert applicant.has_thumbnails
+
+    def test_if_backfill_creates_missing_thumbnails(self):
+        applicant = baker.make(Applicant, application_date=baker.make(ApplicationDate),
+                               image=create_image())
+        # An image from before the thumbnails, no job for it
+        Job.objects.all().delete()
+
+        call_command('backfill_thumbnails', stdout=io.StringIO())
+        run_jobs()
+
+        applicant.refresh_from_db()
+        assert applicant.has_thumbnails
+        assert applicant.image.storage.exists(
+            thumbnail_name(applicant.image.name, THUMBNAIL_SIZES['small']))
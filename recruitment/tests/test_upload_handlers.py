@@ -0,0 +1,70 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from model_bakery import baker
+from rest_framework import status
+
+from recruitment.models import Applicant, ApplicationDate
+from recruitment.upload_handlers import FieldSizeLimitUploadHandler, REQUEST_MAX_SIZE
+from recruitment.validators import DOCUMENT_SIZE_LIMITS, IMAGE_MAX_SIZE
+
+
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    return tmp_path
+
+
+@pytest.fixture
+def spied_handler(mocker):
+    return mocker.spy(FieldSizeLimitUploadHandler, 'receive_data_chunk')
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('media_root')
+class TestFieldSizeLimitUploadHandler:
+    """ If you don't want field validation use Model Baker """
+
+    def test_if_oversized_image_is_stopped_return_413(self, superuser_client, spied_handler):
+        applicant = baker.make(Applicant, application_date=baker.make(ApplicationDate))
+        image = SimpleUploadedFile('photo.jpg', b'x' * (20 * IMAGE_MAX_SIZE),
+                                   content_type='image/jpeg')
+
+        response = superuser_client.patch(f'/recruitment/applicants/{applicant.pk}/',
+                                          {'image': image}, format='multipart')
+
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert response.data['image'] == ['File size cannot be larger than 300KB']
+        # Stopped at the first chunk over the limit, not at the end of the file
+        received = sum(len(call.args[1]) for call in spied_handler.call_args_list)
+        assert received < 2 * IMAGE_MAX_SIZE
+
+    def test_if_oversized_document_is_stopped_return_413(self, superuser_client):
+        resume = SimpleUploadedFile('resume.pdf', b'x' * (DOCUMENT_SIZE_LIMITS['resume'] + 1),
+                                    content_type='application/pdf')
+
+        response = superuser_client.post('/recruitment/applicant-documents/',
+                                         {'resume': resume}, format='multipart')
+
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert response.data['resume'] == ['File size cannot be larger than 2MB']
+
+    def test_if_oversized_request_is_not_read_return_413(self, superuser_client, spied_handler):
+        response = superuser_client.generic(
+            'POST', '/recruitment/applicant-documents/', b'',
+            content_type='multipart/form-data; boundary=BoUnDaRy',
+            CONTENT_LENGTH=str(REQUEST_MAX_SIZE + 1))
+
+        assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+        assert 'non_field_errors' in response.data
+        spied_handler.assert_not_called()
+
+    def test_if_file_under_the_limit_reaches_the_serializer_return_400(self, superuser_client):
+        applicant = baker.make(Applicant, application_date=baker.make(ApplicationDate))
+        image = SimpleUploadedFile('photo.jpg', b'x' * 1024, content_type='image/jpeg')
+
+        response = superuser_client.patch(f'/recruitment/applicants/{applicant.pk}/',
+                                          {'image': image}, format='multipart')
+
+        # The handler lets it through, the ImageField rejects the fake image
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'image' in response.data
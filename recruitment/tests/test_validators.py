@@ -0,0 +1,68 @@
+import io
+
+import pytest
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from recruitment.validators import (
+    DOCUMENT_SIZE_LIMITS, validate_document_file, validate_document_files,
+    validate_pdf_structure)
+
+
+def create_pdf(pages=1):
+    pdf_buffer = io.BytesIO()
+    c = canvas.Canvas(pdf_buffer, pagesize=letter)
+    for _ in range(pages):
+        c.drawString(100, 750, "Hello, this is a PDF file generated dynamically!")
+        c.showPage()
+    c.save()
+    return pdf_buffer.getvalue()
+
+
+def upload(content, name='file.pdf'):
+    return SimpleUploadedFile(name, content, content_type='application/pdf')
+
+
+class UnreadableFile:
+    """ Fails the test if the validator reads it """
+    size = DOCUMENT_SIZE_LIMITS['resume'] + 1
+
+    def seek(self, offset):
+        raise AssertionError('The file was read')
+
+    read = seek
+
+
+class TestPdfValidation:
+
+    def test_if_pdf_is_valid(self):
+        validate_pdf_structure(upload(create_pdf(pages=3)))
+
+    def test_if_renamed_image_is_rejected(self):
+        with pytest.raises(ValidationError, match='not a PDF'):
+            validate_pdf_structure(upload(b'\xff\xd8\xff\xe0' + b'\x00' * 5000))
+
+    def test_if_truncated_pdf_is_rejected(self):
+        content = create_pdf()
+        with pytest.raises(ValidationError, match='incomplete'):
+            validate_pdf_structure(upload(content[:len(content) // 2]))
+
+    def test_if_pdf_without_pages_is_rejected(self):
+        content = create_pdf().replace(b'/Count 1', b'/Count 0')
+        with pytest.raises(ValidationError, match='no pages'):
+            validate_pdf_structure(upload(content))
+
+    def test_if_oversized_file_is_rejected_without_reading_it(self):
+        with pytest.raises(ValidationError, match='larger than'):
+            validate_document_file('resume', UnreadableFile())
+
+    def test_if_every_file_of_a_submission_is_checked(self):
+        errors = validate_document_files({
+            'degree': upload(create_pdf()),
+            'resume': upload(b'not a pdf'),
+            'application_letter': UnreadableFile(),
+        })
+
+        assert set(errors) == {'resume', 'application_letter'}
@@ -0,0 +1,64 @@
+import io
+import os
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# Name -> longest side in pixels
+THUMBNAIL_SIZES = {'small': 64, 'medium': 160, 'large': 320}
+THUMBNAIL_QUALITY = 80
+
+
+def thumbnail_name(image_name, pixels):
+    """
+    'recruitment/images/12.jpg' -> 'recruitment/images/12-jpg-64.webp', the
+    extension is kept so a new 12.png doesn't share the old thumbnails.
+    """
+    root, extension = os.path.splitext(image_name)
+    return f'{root}-{extension.lstrip(".").lower()}-{pixels}.webp'
+
+
+def thumbnail_names(image_name):
+    return {size: thumbnail_name(image_name, pixels)
+            for size, pixels in THUMBNAIL_SIZES.items()}
+
+
+def make_thumbnails(image):
+    """
+    Save a WebP of every THUMBNAIL_SIZES next to the 'image' FieldFile.
+    The image is decoded once and each size is reduced from the previous
+    bigger one.
+    """
+    with image.open('rb') as file, Image.open(file) as original:
+        picture = ImageOps.exif_transpose(original)
+        picture = picture.convert('RGBA' if 'A' in picture.getbands() else 'RGB')
+
+    for size, pixels in sorted(THUMBNAIL_SIZES.items(), key=lambda item: -item[1]):
+        picture.thumbnail((pixels, pixels))
+        buffer = io.BytesIO()
+        picture.save(buffer, 'WEBP', quality=THUMBNAIL_QUALITY, method=4)
+
+        name = thumbnail_name(image.name, pixels)
+        # The default storage would add a suffix instead of overwriting
+        image.storage.delete(name)
+        image.storage.save(name, ContentFile(buffer.getvalue()))
+
+
+def delete_thumbnails(image_name, storage):
+    for name in thumbnail_names(image_name).values():
+        storage.delete(name)
+
+
+def thumbnail_urls(image, has_thumbnails):
+    """
+    {size: url} of an 'image' FieldFile, built from the name only so a
+    list page doesn't check the storage once per row. Every size is the
+    image URL until 'has_thumbnails' [Person.has_thumbnails], i.e. before
+    the job ran or for an image not backfilled yet.
+    """
+    if not image:
+        return None
+    if not has_thumbnails:
+        return {size: image.url for size in THUMBNAIL_SIZES}
+    return {size: image.storage.url(name)
+            for size, name in thumbnail_names(image.name).items()}
@@ -0,0 +1,75 @@
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.http import QueryDict
+from django.utils.datastructures import MultiValueDict
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.parsers import MultiPartParser
+
+from .validators import DOCUMENT_SIZE_LIMITS, IMAGE_MAX_SIZE
+
+# Form field name -> bytes, Person.image and the document FileFields
+FIELD_SIZE_LIMITS = {'image': IMAGE_MAX_SIZE, **DOCUMENT_SIZE_LIMITS}
+# Room for the other form fields and the multipart headers
+REQUEST_OVERHEAD = 1024 * 1024
+REQUEST_MAX_SIZE = sum(FIELD_SIZE_LIMITS.values()) + REQUEST_OVERHEAD
+
+
+class FieldSizeLimitUploadHandler(FileUploadHandler):
+    """
+    First of settings.FILE_UPLOAD_HANDLERS. Counts the bytes of each file
+    as they arrive and stops reading the request as soon as a field goes
+    over FIELD_SIZE_LIMITS, instead of letting the next handlers spool the
+    whole file for validate_file_size to reject it. The errors are left
+    in 'request.upload_size_errors' for SizeLimitedMultiPartParser.
+    """
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        self.request.upload_size_errors = {}
+        if content_length > REQUEST_MAX_SIZE:
+            self.request.upload_size_errors['non_field_errors'] = [
+                f'The request cannot be larger than {REQUEST_MAX_SIZE // (1024 * 1024)}MB.']
+            # Returning a result stops Django from reading the body at all
+            return QueryDict(encoding=encoding), MultiValueDict()
+        return None
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.limit = FIELD_SIZE_LIMITS.get(field_name)
+        self.received = 0
+        if self.limit is not None and self.content_length and self.content_length > self.limit:
+            self.abort()
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.limit is not None and self.received > self.limit:
+            self.abort()
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
+
+    def abort(self):
+        limit_in_kb = self.limit // 1024
+        limit = f'{limit_in_kb // 1024}MB' if limit_in_kb >= 1024 else f'{limit_in_kb}KB'
+        self.request.upload_size_errors[self.field_name] = [
+            f'File size cannot be larger than {limit}']
+        # The rest of the body is never read
+        raise StopUpload(connection_reset=True)
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'The upload is too large.'
+    default_code = 'upload_too_large'
+
+
+class SizeLimitedMultiPartParser(MultiPartParser):
+    """ Turns what FieldSizeLimitUploadHandler stopped into a 413 """
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        data_and_files = super().parse(stream, media_type, parser_context)
+        request = parser_context['request']
+        errors = getattr(request._request, 'upload_size_errors', None)
+        if errors:
+            raise UploadTooLarge(errors)
+        return data_and_files
@@ -0,0 +1,111 @@
+"""
+Resumable upload of the ApplicantDocument files:
+
+    1. POST document-uploads/ {field, filename, size} -> {id, offset: 0}
+    2. PUT document-uploads/{id}/chunk/ raw bytes with 'Upload-Offset'
+       header = the current offset. Repeat until offset == size.
+       After a dropped connection GET document-uploads/{id}/ gives the
+       offset to resume from, only the missing bytes are sent again.
+    3. Send '<field>_upload': id instead of the file to applicant-documents.
+
+An upload that isn't attached UPLOAD_EXPIRY after it started is
+abandoned, 'manage.py expire_uploads' [run it from cron] removes it.
+"""
+import os
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.files import File
+from django.utils import timezone
+
+from .models import DocumentUpload
+
+CHUNK_MAX_SIZE = 1024 * 1024
+READ_SIZE = 64 * 1024
+UPLOAD_EXPIRY = timedelta(days=1)
+
+
+class OffsetMismatch(Exception):
+    pass
+
+
+def append_chunk(upload, stream, offset, length):
+    """
+    Write 'length' bytes of 'stream' at 'offset' of the partial file and
+    move the upload offset. The chunk is copied READ_SIZE at a time so a
+    request never holds more than that in memory. 'upload' must be
+    locked [select_for_update] by the caller.
+    """
+    if offset != upload.offset:
+        raise OffsetMismatch()
+
+    path = upload.partial_path
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'r+b' if os.path.exists(path) else 'wb') as partial:
+        # Bytes past the offset are from a chunk that didn't complete
+        partial.truncate(offset)
+        partial.seek(offset)
+        remaining = length
+        while remaining:
+            data = stream.read(min(READ_SIZE, remaining))
+            if not data:
+                break
+            partial.write(data)
+            remaining -= len(data)
+
+    upload.offset = offset + length - remaining
+    upload.save(update_fields=['offset'])
+    return upload
+
+
+def attach_upload(document, upload):
+    """
+    Move a completed upload to its file field of the document, the file
+    is copied by the storage from the partial file without loading it.
+    """
+    with open(upload.partial_path, 'rb') as partial:
+        getattr(document, upload.field).save(
+            upload.filename, File(partial), save=False)
+
+
+def discard_upload(upload):
+    if os.path.exists(upload.partial_path):
+        os.remove(upload.partial_path)
+    upload.delete()
+
+
+def expire_uploads(expiry=UPLOAD_EXPIRY):
+    """
+    Discard the uploads started more than 'expiry' ago, then the partial
+    files as old that have no upload left [e.g. its user was deleted].
+    Returns (uploads, orphan files) removed.
+    """
+    expired = DocumentUpload.objects.filter(created_at__lt=timezone.now() - expiry)
+    upload_count = 0
+    for upload in expired.iterator():
+        discard_upload(upload)
+        upload_count += 1
+
+    directory = DocumentUpload.partial_directory()
+    if not os.path.isdir(directory):
+        return upload_count, 0
+
+    cutoff = time.time() - expiry.total_seconds()
+    old_files = {entry.name.removesuffix('.part'): entry.path
+                 for entry in os.scandir(directory)
+                 if entry.name.endswith('.part') and entry.stat().st_mtime < cutoff}
+    live_ids = {str(pk) for pk in DocumentUpload.objects.filter(
+        pk__in=[name for name in old_files if _is_uuid(name)]).values_list('pk', flat=True)}
+    orphans = [path for name, path in old_files.items() if name not in live_ids]
+    for path in orphans:
+        os.remove(path)
+    return upload_count, len(orphans)
+
+
+def _is_uuid(value):
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
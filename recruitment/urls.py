@@ -6,10 +6,12 @@ router = routers.DefaultRouter()
 
 router.register('application-dates', views.ApplicationDateViewSet)
 router.register('application-stages', views.QualifyApplicantViewSet)
+router.register('stages', views.ApplicationStageViewSet)
 
 router.register('applicant-screenings', views.ApplicantScreeningViewSet, basename='app-screenings')
 router.register('applicants', views.ApplicantViewSet, basename='apps')
 router.register('applicant-documents', views.ApplicantDocumentViewSet)
+router.register('document-uploads', views.DocumentUploadViewSet, basename='document-uploads')
 router.register('applicant-address', views.ApplicantAddressViewSet)
 router.register('applicant-contacts', views.ApplicantContactViewSet)
 router.register('applicant-profile',
@@ -1,5 +1,9 @@
 import os
-from django.db import connection
+import threading
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import BigIntegerField, F, Max
+from django.db.models.functions import Cast
 
 
 def image_upload_path(instance, filename):
@@ -106,23 +110,73 @@ def emp_reference_letter_upload_path(instance, filename):
     return file_path
 
 
+# Numbers reserved by this worker but not handed out yet,
+# {sequence name: (next value, last value)}
+_id_number_blocks = {}
+_id_number_blocks_lock = threading.Lock()
+
+
+def _seed_id_number_sequence(name):
+    """
+    Create the counter row from the biggest existing id_number. The
+    column is text so it's cast, otherwise MAX() says '999' > '1000'.
+    """
+    from django.apps import apps
+
+    model = apps.get_model('recruitment', name)
+    sequence_model = apps.get_model('recruitment', 'IdNumberSequence')
+    latest_number = model.objects.aggregate(
+        latest=Max(Cast('id_number', BigIntegerField())))['latest']
+    sequence_model.objects.get_or_create(
+        name=name, defaults={'last_value': latest_number or 0})
+
+
+def allocate_id_numbers(name, count=1):
+    """
+    Reserve 'count' consecutive numbers of the 'name' sequence and
+    return the first one. The UPDATE locks the counter row until the
+    transaction ends so concurrent registrations can't get the same
+    number, and it's one row no matter how many applicants exist.
+    """
+    from django.apps import apps
+
+    sequence_model = apps.get_model('recruitment', 'IdNumberSequence')
+    with transaction.atomic():
+        sequences = sequence_model.objects.filter(name=name)
+        if not sequences.update(last_value=F('last_value') + count):
+            _seed_id_number_sequence(name)
+            sequences.update(last_value=F('last_value') + count)
+        last_value = sequences.values_list('last_value', flat=True).get()
+
+    return last_value - count + 1
+
+
+def next_id_number(name):
+    """
+    settings.ID_NUMBER_BLOCK_SIZE > 1 makes each worker reserve a block
+    of numbers at once and hand them out from memory. A block is only
+    kept when the reservation is committed right away [no surrounding
+    atomic block], a rolled back block could be reserved again by
+    another worker. Unused numbers of a block are lost when the worker
+    stops, so block allocation leaves gaps.
+    """
+    block_size = getattr(settings, 'ID_NUMBER_BLOCK_SIZE', 1)
+    if block_size <= 1 or connection.in_atomic_block:
+        return str(allocate_id_numbers(name)).zfill(3)
+
+    with _id_number_blocks_lock:
+        next_value, last_value = _id_number_blocks.get(name, (1, 0))
+        if next_value > last_value:
+            next_value = allocate_id_numbers(name, block_size)
+            last_value = next_value + block_size - 1
+        _id_number_blocks[name] = (next_value + 1, last_value)
+
+    return str(next_value).zfill(3)
+
+
 def applicant_id_number_generator():
-    with connection.cursor() as cursor:
-        cursor.execute(
-            'SELECT MAX(id_number) FROM recruitment_applicant')
-        latest_applicant_number = cursor.fetchone()[0]
-    new_applicant_number = int(latest_applicant_number) + \
-        1 if latest_applicant_number is not None else 1
-    new_applicant_number = str(new_applicant_number).zfill(3)
-    return new_applicant_number
+    return next_id_number('Applicant')
 
 
 def pyp_id_number_generator():
-    with connection.cursor() as cursor:
-        cursor.execute(
-            'SELECT MAX(id_number) FROM recruitment_pyp')
-        latest_pyp_number = cursor.fetchone()[0]
-    new_pyp_number = int(latest_pyp_number) + \
-        1 if latest_pyp_number is not None else 1
-    new_pyp_number = str(new_pyp_number).zfill(3)
-    return new_pyp_number
+    return next_id_number('Pyp')
@@ -1,9 +1,15 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+
 from django.core.exceptions import ValidationError
 
 
+IMAGE_MAX_SIZE = 300 * 1024
+
+
 def validate_file_size(file):
-    max_size_in_kb = 300
-    if file.size > max_size_in_kb * 1024:
+    max_size_in_kb = IMAGE_MAX_SIZE // 1024
+    if file.size > IMAGE_MAX_SIZE:
         raise ValidationError(
             f'File size cannot be larger than {max_size_in_kb}KB')
 
@@ -16,3 +22,89 @@ def validate_year(value):
 def validate_district(value):
     if value == 0:
         raise ValidationError('District number must be greater than 0.')
+
+
+# Bytes a document file field accepts, 'tor' is the transcript of records
+DOCUMENT_SIZE_LIMITS = {
+    'degree': 5 * 1024 * 1024,
+    'police_clearance': 5 * 1024 * 1024,
+    'application_letter': 2 * 1024 * 1024,
+    'community_letter': 2 * 1024 * 1024,
+    'reference_letter': 2 * 1024 * 1024,
+    'resume': 2 * 1024 * 1024,
+    'tor': 10 * 1024 * 1024,
+}
+DOCUMENT_MAX_SIZE = max(DOCUMENT_SIZE_LIMITS.values())
+
+# Only these many bytes of the start and the end of a PDF are read
+PDF_HEAD_SIZE = 64 * 1024
+PDF_TAIL_SIZE = 16 * 1024
+
+PDF_START_XREF = re.compile(rb'startxref\s+(\d+)\s+%%EOF')
+PDF_PAGE_COUNTS = [
+    # The page tree root, unless it's inside a compressed object stream
+    re.compile(rb'/Type\s*/Pages\b[^>]*?/Count\s+(\d+)'),
+    re.compile(rb'/Count\s+(\d+)[^>]*?/Type\s*/Pages\b'),
+    # Linearized [fast web view] files give it in their first object
+    re.compile(rb'/Linearized\b[^>]*?/N\s+(\d+)'),
+]
+
+
+def validate_pdf_structure(file):
+    """
+    Check that 'file' looks like a PDF from its first PDF_HEAD_SIZE and
+    last PDF_TAIL_SIZE bytes: the '%PDF-' header, a 'startxref' pointing
+    inside the file followed by '%%EOF' and, when the page tree can be
+    found in those bytes, at least one page. The whole file is never read.
+    """
+    size = file.size
+    file.seek(0)
+    head = file.read(min(size, PDF_HEAD_SIZE))
+    # Readers accept a few bytes of garbage before the header
+    if b'%PDF-' not in head[:1024]:
+        raise ValidationError('The file is not a PDF.')
+
+    file.seek(max(0, size - PDF_TAIL_SIZE))
+    tail = file.read()
+    file.seek(0)
+
+    start_xrefs = PDF_START_XREF.findall(tail)
+    if not start_xrefs or int(start_xrefs[-1]) >= size:
+        raise ValidationError('The PDF is incomplete or damaged.')
+
+    for pattern in PDF_PAGE_COUNTS:
+        page_counts = pattern.findall(head) or pattern.findall(tail)
+        if page_counts:
+            if int(page_counts[0]) == 0:
+                raise ValidationError('The PDF has no pages.')
+            break
+
+
+def validate_document_file(field, file):
+    """ The size is checked first, an oversized file isn't read at all """
+    limit = DOCUMENT_SIZE_LIMITS.get(field, DOCUMENT_MAX_SIZE)
+    if file.size > limit:
+        raise ValidationError(
+            f'File size cannot be larger than {limit // (1024 * 1024)}MB')
+    validate_pdf_structure(file)
+
+
+def validate_document_files(files):
+    """
+    Run validate_document_file on every {field: file} of a submission in
+    threads, the reads of the files overlap. Returns {field: [errors]}.
+    """
+    if not files:
+        return {}
+
+    def check(item):
+        field, file = item
+        try:
+            validate_document_file(field, file)
+        except ValidationError as error:
+            return field, error.messages
+        return field, None
+
+    with ThreadPoolExecutor(max_workers=len(files)) as executor:
+        results = executor.map(check, files.items())
+    return {field: messages for field, messages in results if messages}
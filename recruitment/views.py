@@ -1,16 +1,22 @@
-import os
+import hashlib
+from django.core.cache import cache
 from django.db import transaction
-from django.db.models import Count, Q
-from django.conf import settings
-from rest_framework.viewsets import ModelViewSet
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from django.utils.http import parse_etags, quote_etag
+from rest_framework.decorators import action
+from rest_framework.viewsets import GenericViewSet, ModelViewSet
+from rest_framework import mixins
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.filters import SearchFilter
 from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.utils import translate_validation
 
 from core import permissions
-from . import models, serializers, filters
+from core.cache import get_version
+from core.mixins import VersionedCacheMixin
+from . import models, serializers, filters, pagination, exports, uploads, jobs, search
 
 
 class Permission(ModelViewSet):
@@ -26,29 +32,171 @@ class Permission(ModelViewSet):
         return super().get_permissions()
 
 
-class ApplicationDateViewSet(Permission):
+class QueryShapingMixin:
+    """
+    Narrow the GET queryset to the sparse fieldset the client asked for,
+    see serializers.DynamicFieldsModelSerializer. The pagination ordering
+    columns are always kept so the cursor doesn't reload the last row.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method != 'GET':
+            return queryset
+
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, serializers.DynamicFieldsModelSerializer):
+            return queryset
+
+        requested_fields = serializer_class.requested_fields(
+            self.request.query_params)
+        if requested_fields is None:
+            return queryset
+
+        ordering = getattr(self.paginator, 'ordering', ())
+        ordering_columns = [field.lstrip('-').removesuffix('_id')
+                            for field in ordering]
+        return serializer_class.shape_queryset(
+            queryset, requested_fields, extra_columns=ordering_columns)
+
+
+class ConditionalRetrieveMixin:
+    """
+    ETag on retrieve built from the updated_at of the object and of the
+    'etag_relations' its serializer shows, plus their row counts so a
+    deleted contact changes it too. It's one aggregate query, a matching
+    If-None-Match gets a 304 before the object is loaded or serialized.
+    """
+    etag_relations = ()
+
+    def get_etag(self):
+        aggregates = {'updated_at': Max('updated_at')}
+        for relation in self.etag_relations:
+            aggregates[f'{relation}_updated_at'] = Max(f'{relation}__updated_at')
+            aggregates[f'{relation}_count'] = Count(relation, distinct=True)
+
+        lookup = {self.lookup_field: self.kwargs[self.lookup_url_kwarg or self.lookup_field]}
+        versions = self.get_queryset().filter(**lookup).values('pk').annotate(
+            **aggregates).values_list(*aggregates).first()
+        if versions is None:
+            return None
+
+        # The same rows are rendered differently per query string and
+        # format, and per scheme and host [the absolute image URLs]
+        request = self.request
+        key = f'{versions}|{request.build_absolute_uri()}|{request.headers.get("Accept", "")}'
+        return quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+    def retrieve(self, request, *args, **kwargs):
+        etag = self.get_etag()
+        if etag is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        if_none_match = parse_etags(request.headers.get('If-None-Match', ''))
+        if etag in if_none_match or '*' in if_none_match:
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+
+        response = super().retrieve(request, *args, **kwargs)
+        response['ETag'] = etag
+        return response
+
+
+class ApplicationDateViewSet(VersionedCacheMixin, Permission):
     queryset = models.ApplicationDate.objects.order_by('-open_date')
     serializer_class = serializers.ApplicationDateSerializer
+    cache_namespace = models.ApplicationDate.CACHE_NAMESPACE
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
             return serializers.ReadApplicationDateSerializer
         return super().get_serializer_class()
 
+    @action(detail=True)
+    def dashboard(self, request, pk=None):
+        """
+        Applicant counts by county, gender, religion, qualification, status
+        and stage. Cached until an Applicant, ApplicantDocument or Screening
+        changes, see signals.py.
+        """
+        application_date = self.get_object()
+        namespace = models.ApplicationDate.DASHBOARD_CACHE_NAMESPACE
+        cache_key = f'{namespace}:{application_date.pk}:{get_version(namespace)}'
+        counts = cache.get(cache_key)
+        if counts is None:
+            counts = application_date.applicant_counts()
+            cache.set(cache_key, counts, timeout=None)
+
+        return Response(counts)
+
+
+class ApplicationStageViewSet(VersionedCacheMixin, Permission):
+    """ The stages are created with their ApplicationDate, see ApplicationDateSerializer """
+    http_method_names = ['get']
+    queryset = models.ApplicationStage.objects.order_by('application_date', 'order')
+    serializer_class = serializers.ApplicationStageSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['application_date', 'is_current']
+    cache_namespace = models.ApplicationStage.CACHE_NAMESPACE
+
 
-class ApplicantViewSet(ModelViewSet):  # You must apply permissions
+class ApplicantViewSet(QueryShapingMixin, ModelViewSet):  # You must apply permissions
     """
     Only applicant should post, if someone wants to 
     proxy they MUST use the applicant credentials to login.
     """
     queryset = models.Applicant.objects.select_related(
         'user', 'document', 'address').prefetch_related('contacts').all()
+    pagination_class = pagination.ApplicantCursorPagination
 
     def get_serializer_class(self):
         if self.request.method == 'GET':
             return serializers.ReadApplicantSerializer
         return serializers.ApplicantSerializer
 
+    def list(self, request, *args, **kwargs):
+        """
+        '?q=' returns the best '?page_size=' matches of the full text
+        search [search.py] best first, in a single page.
+        """
+        terms = request.query_params.get('q')
+        if not terms:
+            return super().list(request, *args, **kwargs)
+
+        queryset = self.get_queryset().order_by(*self.paginator.ordering)
+        applicants = search.search_applicants(
+            queryset, terms, self.paginator.get_page_size(request))
+        serializer = self.get_serializer(applicants, many=True)
+        return Response({'next': None, 'previous': None, 'results': serializer.data})
+
+    @action(detail=False)
+    def export(self, request):
+        """
+        Stream the applicants [optionally '?application_date='] with their
+        document, address and contacts flattened. '?file_type=xlsx' for
+        Excel, CSV otherwise. Nothing is materialized, memory stays flat
+        whatever the number of applicants.
+        """
+        queryset = models.Applicant.objects.select_related(
+            'user', 'document', 'address').prefetch_related('contacts').order_by('apply_at', 'user_id')
+        params = serializers.RecruitmentQuerySerializer(
+            data={key: value for key, value in request.query_params.items() if value})
+        params.is_valid(raise_exception=True)
+        application_date = params.validated_data.get('application_date')
+        if application_date:
+            queryset = queryset.filter(application_date_id=application_date)
+
+        rows = exports.applicant_rows(queryset)
+        if request.query_params.get('file_type') == 'xlsx':
+            response = StreamingHttpResponse(
+                exports.xlsx_stream(rows),
+                content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+            response['Content-Disposition'] = 'attachment; filename="applicants.xlsx"'
+        else:
+            response = StreamingHttpResponse(
+                exports.csv_stream(rows), content_type='text/csv')
+            response['Content-Disposition'] = 'attachment; filename="applicants.csv"'
+        return response
+
     def create(self, request, *args, **kwargs):
         """
         I'm using FormData to post because of the image(binary) and 
@@ -70,24 +218,15 @@ class ApplicantViewSet(ModelViewSet):  # You must apply permissions
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-    def update(self, request, *args, **kwargs):
-        """ See validators.py for MAX_SIZE. Deleting the old image and saving the new one"""
-        instance = self.get_object()
-        new_image = request.data.get('image', None)
-
-        if new_image:
-            img_name = new_image.name
-            _, extension = os.path.splitext(img_name)
-            MAX_SIZE = 1024 * 300
-            ALLOWED_EXTENSIONS = ['.jpg', '.png', '.jpeg', '.gif', '.webp']
-
-            if new_image.size <= MAX_SIZE and instance.image and extension.lower() in ALLOWED_EXTENSIONS:
-                old_image_path = os.path.join(
-                    settings.MEDIA_ROOT, str(instance.image))
-                if os.path.exists(old_image_path):
-                    os.remove(old_image_path)
-
-        return super().update(request, *args, **kwargs)
+    def perform_update(self, serializer):
+        """
+        See validators.py for MAX_SIZE. The old image and its thumbnails
+        are deleted by a job once the new one is saved [see tasks.py]
+        """
+        old_image = serializer.instance.image.name
+        instance = serializer.save()
+        if old_image and instance.image.name != old_image:
+            jobs.enqueue('delete_image', name=old_image)
 
 
 class ApplicantDocumentViewSet(ModelViewSet):
@@ -105,31 +244,57 @@ class ApplicantDocumentViewSet(ModelViewSet):
         'applicant').all()
     serializer_class = serializers.ApplicantDocumentSerializer
 
+    def documents_response(self, documents, filename):
+        response = StreamingHttpResponse(
+            exports.documents_zip_stream(documents), content_type='application/zip')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+    @action(detail=True)
+    def download(self, request, pk=None):
+        """ ZIP of all the files of one applicant, streamed from the storage """
+        document = self.get_object()
+        documents = self.get_queryset().filter(pk=document.pk)
+        return self.documents_response(documents, f'documents-{document.pk}.zip')
+
+    @action(detail=False)
+    def bundle(self, request):
+        """
+        ZIP of all the files of the applicants in '?stage=' or in the
+        recruitment '?application_date='. The archive is generated while
+        it's sent, one file chunk at a time.
+        """
+        params = serializers.RecruitmentQuerySerializer(
+            data={key: value for key, value in request.query_params.items() if value})
+        params.is_valid(raise_exception=True)
+        # Integers only, they go into the Content-Disposition filename
+        stage = params.validated_data.get('stage')
+        application_date = params.validated_data.get('application_date')
+        if stage:
+            documents = self.get_queryset().filter(applicant__stages=stage)
+            filename = f'stage-{stage}-documents.zip'
+        elif application_date:
+            documents = self.get_queryset().filter(
+                applicant__application_date=application_date)
+            filename = f'recruitment-{application_date}-documents.zip'
+        else:
+            return Response({'detail': "Provide 'stage' or 'application_date'."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        return self.documents_response(documents.order_by('applicant_id'), filename)
+
     def create(self, request, *args, **kwargs):
         """
         I'm using FormData to post because of the files(binary) and 
-        each field is placed in a list
+        each field is placed in a list, JSON is accepted when all the
+        files were sent with document-uploads [see uploads.py]
 
         See this class for generic comment
         """
-        data = request.data.copy()
-        document_data = {
-            'applicant': data.pop('applicant')[0],
-            'cgpa': data.pop('cgpa')[0],
-            'qualification': data.pop('qualification')[0],
-            'institution': data.pop('institution')[0],
-            'major': data.pop('major')[0],
-            'manor': data.pop('manor')[0],
-            'country': data.pop('country')[0],
-            'county': data.pop('county')[0],
-            'graduation_year': data.pop('graduation_year')[0],
-            'degree': data.pop('degree')[0],
-            'application_letter': data.pop('application_letter')[0],
-            'reference_letter': data.pop('reference_letter')[0],
-            'community_letter': data.pop('community_letter')[0],
-            'police_clearance': data.pop('police_clearance')[0],
-            'resume': data.pop('resume')[0]
-        }
+        document_data = request.data
+        if hasattr(document_data, 'dict'):
+            # FormData, a file can also be sent as a '<field>_upload' id
+            document_data = document_data.dict()
         serializer = self.get_serializer(data=document_data)
         serializer.is_valid(raise_exception=True)
         serializer.save()
@@ -137,6 +302,56 @@ class ApplicantDocumentViewSet(ModelViewSet):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
+class DocumentUploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin,
+                            mixins.DestroyModelMixin, GenericViewSet):
+    """
+    Resumable upload of an ApplicantDocument file, see uploads.py for the
+    protocol. Users only see their own uploads.
+    """
+    serializer_class = serializers.DocumentUploadSerializer
+
+    def get_queryset(self):
+        return models.DocumentUpload.objects.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    def perform_destroy(self, instance):
+        uploads.discard_upload(instance)
+
+    @action(detail=True, methods=['put'])
+    def chunk(self, request, pk=None):
+        """
+        Raw bytes [any Content-Type] starting at the 'Upload-Offset' header.
+        A wrong offset returns 409 with the offset to resume from.
+        """
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.headers['Content-Length'])
+        except (KeyError, ValueError):
+            return Response({'detail': "'Upload-Offset' and 'Content-Length' headers are required."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        if not 0 < length <= uploads.CHUNK_MAX_SIZE:
+            return Response({'detail': f'A chunk must be between 1 and {uploads.CHUNK_MAX_SIZE} bytes.'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            upload = self.get_queryset().select_for_update().filter(pk=pk).first()
+            if upload is None:
+                return Response(status=status.HTTP_404_NOT_FOUND)
+            if offset + length > upload.size:
+                return Response({'detail': 'The chunk goes past the file size.'},
+                                status=status.HTTP_400_BAD_REQUEST)
+            try:
+                uploads.append_chunk(upload, request.stream, offset, length)
+            except uploads.OffsetMismatch:
+                return Response({'detail': 'Wrong offset.', 'offset': upload.offset},
+                                status=status.HTTP_409_CONFLICT)
+
+        return Response(self.get_serializer(upload).data)
+
+
 class ApplicantAddressViewSet(ModelViewSet):
     """ 
     If I get user_id from self.request.user.id and pass it to the 
@@ -157,23 +372,29 @@ class ApplicantContactViewSet(ModelViewSet):
     queryset = models.ApplicantContact.objects.select_related('applicant')
     serializer_class = serializers.ApplicantContactSerializer
 
+    def get_queryset(self):
+        """ Nested under applicants/{applicant_pk}/contacts/ only that applicant contacts """
+        queryset = super().get_queryset()
+        if 'applicant_pk' in self.kwargs:
+            return queryset.filter(applicant_id=self.kwargs['applicant_pk'])
+        return queryset
 
-class ApplicantProfileViewSet(ModelViewSet):
+
+class ApplicantProfileViewSet(ConditionalRetrieveMixin, ModelViewSet):
     http_method_names = ['get']
     serializer_class = serializers.ReadApplicantSerializer
     permission_classes = [IsAuthenticated]
+    etag_relations = ('user', 'document', 'address', 'contacts')
 
     def get_queryset(self):
         queryset = models.Applicant.objects.filter(user_id=self.kwargs['pk'])
         return queryset
 
 
-class EmployeeViewSet(Permission):
-    """ Searching and filtering by county is not working maybe due to inconsistacy of the county data!!! """
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+class EmployeeViewSet(QueryShapingMixin, Permission):
+    """ Exact filters on the choice fields, see filters.EmployeeFilter """
+    filter_backends = [DjangoFilterBackend]
     filterset_class = filters.EmployeeFilter
-    search_fields = ['religion', 'gender',
-                     'qualification', 'employment', 'county']
 
     queryset = models.Employee.objects.select_related(
         'user', 'address').prefetch_related('contacts', 'documents').all()
@@ -215,24 +436,24 @@ class EmployeeViewSet(Permission):
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-    def update(self, request, *args, **kwargs):
-        """ See validators.py for MAX_SIZE. Deleting the old image and saving the new one"""
-        instance = self.get_object()
-        new_image = request.data.get('image', None)
-
-        if new_image:
-            img_name = new_image.name
-            _, extension = os.path.splitext(img_name)
-            MAX_SIZE = 1024 * 300
-            ALLOWED_EXTENSIONS = ['.jpg', '.png', '.jpeg', '.gif', '.webp']
-
-            if new_image.size <= MAX_SIZE and instance.image and extension.lower() in ALLOWED_EXTENSIONS:
-                old_image_path = os.path.join(
-                    settings.MEDIA_ROOT, str(instance.image))
-                if os.path.exists(old_image_path):
-                    os.remove(old_image_path)
+    def perform_update(self, serializer):
+        """
+        See validators.py for MAX_SIZE. The old image and its thumbnails
+        are deleted by a job once the new one is saved [see tasks.py]
+        """
+        old_image = serializer.instance.image.name
+        instance = serializer.save()
+        if old_image and instance.image.name != old_image:
+            jobs.enqueue('delete_image', name=old_image)
 
-        return super().update(request, *args, **kwargs)
+    @action(detail=False)
+    def facets(self, request):
+        """ Count of every choice value under the list filters, see EmployeeFilter.facet_counts """
+        filterset = filters.EmployeeFilter(
+            request.query_params, queryset=models.Employee.objects.all(), request=request)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        return Response(filterset.facet_counts())
 
 
 class EmployeeDocumentViewSet(ModelViewSet):
@@ -291,10 +512,11 @@ class EmployeeContactViewSet(ModelViewSet):
         return query
 
 
-class EmployeeProfileViewSet(ModelViewSet):
+class EmployeeProfileViewSet(ConditionalRetrieveMixin, ModelViewSet):
     http_method_names = ['get']
     serializer_class = serializers.ReadEmployeeSerializer
     permission_classes = [IsAuthenticated]
+    etag_relations = ('user', 'address', 'documents', 'contacts')
 
     def get_queryset(self):
         queryset = models.Employee.objects.filter(user_id=self.kwargs['pk'])
@@ -311,24 +533,35 @@ class EmployeeSupervisorViewSet(ModelViewSet):
 class QualifyApplicantViewSet(ModelViewSet):
     http_method_names = ['get']
     """Don't show any attr that can identify an applicant for transparency purpose"""
-    queryset = models.Applicant.objects.filter(Q(status='Under review') | Q(
-        status='Pending'), stages__is_current=True).select_related('user', 'document')
+    # Applicant.current_stage is a plain FK, the current stage comes with
+    # the applicant row without the 'stages' m2m join
+    queryset = models.Applicant.objects.select_related('user', 'document', 'current_stage')
     serializer_class = serializers.ReadQualifyApplicantSerializr
 
+    def get_queryset(self):
+        """
+        The current stage id is read first [stage_current_idx] so the
+        applicants are one equality lookup on applicant_stage_status_idx.
+        """
+        # Sliced, first() would add an ORDER BY pk the index can't serve
+        stage_ids = list(models.ApplicationStage.objects.filter(
+            application_date__is_current=True, is_current=True).values_list('pk', flat=True)[:1])
+        if not stage_ids:
+            return self.queryset.none()
+        return self.queryset.filter(
+            current_stage_id=stage_ids[0], status__in=['Under review', 'Pending'])
+
 
 class ApplicantScreeningViewSet(ModelViewSet):
     serializer_class = serializers.ApplicantScreeningSerializer
 
     @transaction.atomic()
     def create(self, request, *args, **kwargs):
-        for data in request.data.get('applicants', []):
-            serializer = self.get_serializer(data=data)
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
-
-            applicant = models.Applicant.objects.get(user_id=data['applicant'])
-            applicant.status = data['status']
-            applicant.save()
+        """ See BulkScreeningSerializer, the response is a per row report """
+        serializer = serializers.BulkScreeningSerializer(
+            data={'applicants': request.data.get('applicants', [])})
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
 
         # If you're on the final stage[if order=6] all applicants with 'Pending'
             # status should be updated to 'Successful'
@@ -338,18 +571,20 @@ class ApplicantScreeningViewSet(ModelViewSet):
             # status to 'Successful' and save them.
             
 
-        previous_stage = models.ApplicationStage.objects.get(is_current=True)
+        previous_stage = models.ApplicationStage.objects.get(
+            application_date__is_current=True, is_current=True)
         next_order = previous_stage.order + 1
         previous_stage.is_current = False
         previous_stage.save()
-        # ⚠👿⬇
-        new_stage = models.ApplicationStage.objects.get(order=next_order)
+
+        new_stage = models.ApplicationStage.objects.filter(
+            application_date_id=previous_stage.application_date_id, order=next_order).first()
+        if new_stage is None:  # Final stage, screening closed
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+
         new_stage.is_current = True
         new_stage.save()
-
-        qualify_applicants = [app.user.id for app in models.Applicant.objects.exclude(
-            status__in=['Unsuccessful', 'Under review'])]
-        new_stage.applicants.add(*qualify_applicants)
+        new_stage.add_qualified_applicants()
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 